@@ -0,0 +1,129 @@
+# File: cs412/charts.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: cache for rendered Plotly charts, shared by the analytics apps
+
+import hashlib
+import json
+import os
+import time
+import uuid
+
+import plotly
+from django.contrib.staticfiles.finders import BaseFinder
+from django.core.cache import caches
+from django.core.files.storage import FileSystemStorage
+from django.templatetags.static import static
+
+# alias in settings.CACHES used for rendered charts
+CHART_CACHE = 'charts'
+
+# bumped whenever render_chart output changes, so old cache entries are ignored
+CHART_FORMAT = 2
+
+# plotly.js as shipped inside the plotly package, and where it is served from
+PLOTLY_JS_DIR = os.path.join(os.path.dirname(plotly.__file__), 'package_data')
+PLOTLY_JS = 'plotly/plotly.min.js'
+
+
+def chart_cache():
+    '''return the cache backend holding rendered charts'''
+
+    return caches[CHART_CACHE]
+
+
+def dataset_version(dataset):
+    '''return {'version', 'modified'} for a dataset (e.g. 'voters'),
+    starting a new version if none has been recorded yet'''
+
+    cache = chart_cache()
+    key = f'dataset:{dataset}'
+    info = cache.get(key)
+    if info is None:
+        cache.add(key, {'version': uuid.uuid4().hex, 'modified': time.time()}, None)
+        info = cache.get(key)
+    return info
+
+
+def bump_dataset_version(dataset):
+    '''start a new version of a dataset; called by the data loaders so every
+    chart rendered from the old data is ignored from now on'''
+
+    chart_cache().set(f'dataset:{dataset}', {'version': uuid.uuid4().hex, 'modified': time.time()}, None)
+
+
+def normalize_params(params, ignore=('page', 'cursor')):
+    '''return a sorted list of the non-empty (name, value) pairs in params
+    (a QueryDict or a plain dict), so equivalent requests share a cache key'''
+
+    pairs = []
+    for name in params:
+        if name in ignore:
+            continue
+        values = params.getlist(name) if hasattr(params, 'getlist') else [params[name]]
+        pairs.extend((name, str(value)) for value in values if value not in ('', None))
+    return sorted(pairs)
+
+
+def chart_key(view_name, params, dataset):
+    '''return the cache key for one view's charts under the given parameters'''
+
+    version = dataset_version(dataset)['version']
+    raw = json.dumps([view_name, CHART_FORMAT, version, normalize_params(params)])
+    return f'charts:{view_name}:' + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def cached_charts(view_name, params, dataset, render):
+    '''return the charts (rendered divs, or the data behind them) for
+    view_name and params, calling render() (which runs the queries and any
+    Plotly serialization) only when the current version of dataset has no
+    cached copy'''
+
+    cache = chart_cache()
+    key = chart_key(view_name, params, dataset)
+    charts = cache.get(key)
+    if charts is None:
+        charts = render()
+        cache.set(key, charts)
+    return charts
+
+
+def render_chart(figure):
+    '''render a Plotly figure (dict or Figure) as an HTML div holding only
+    the figure JSON; pages load plotly.js once from {{ plotly_js_url }}'''
+
+    return plotly.offline.plot(figure,
+                               include_plotlyjs=False,
+                               auto_open=False,
+                               output_type="div")
+
+
+def plotly_js(request):
+    '''context processor providing plotly_js_url, versioned so it can be
+    cached by browsers forever'''
+
+    return {'plotly_js_url': f'{static(PLOTLY_JS)}?v={plotly.__version__}'}
+
+
+class PlotlyJSFinder(BaseFinder):
+    '''staticfiles finder exposing the plotly.min.js bundled with the plotly
+    package as static/plotly/plotly.min.js, so collectstatic copies it into
+    STATIC_ROOT without vendoring it in the repo'''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=PLOTLY_JS_DIR)
+        self.storage.prefix = 'plotly'
+
+    def find(self, path, find_all=False, **kwargs):
+        '''return the absolute path of plotly.min.js if that is what is asked for'''
+
+        find_all = find_all or kwargs.get('all', False)
+        if path != PLOTLY_JS:
+            return [] if find_all else None
+        match = self.storage.path('plotly.min.js')
+        return [match] if find_all else match
+
+    def list(self, ignore_patterns):
+        '''yield the one file this finder provides'''
+
+        yield 'plotly.min.js', self.storage
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     "mini_insta", # Assignment 3
     "marathon_analytics", # Module 8 example
     "voter_analytics", # Assiignment 8
+    "loaders", # shared CSV loading and quarantine
     "rest_framework",
     "dadjokes", # Assignment 10
     "thriftiezzz", # Final Project
@@ -75,6 +76,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "cs412.charts.plotly_js",
             ],
         },
     },
@@ -135,6 +137,55 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+
+# Rendered chart cache (see cs412/charts.py). Pick the backend with the
+# CHART_CACHE environment variable:
+#   "file"   - default; shared by every process on this machine, so the data
+#              loaders (run from manage.py) can invalidate the web server's charts
+#   "memory" - per-process LRU cache; loaders cannot invalidate it, entries
+#              simply expire after TIMEOUT seconds
+#   "redis"  - any Redis-compatible server at CHART_CACHE_URL (needs redis-py)
+CHART_CACHE_BACKENDS = {
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, "chart_cache"),
+        "OPTIONS": {"MAX_ENTRIES": 500},  # culls a third of the entries when full
+    },
+    "memory": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "charts",
+        "OPTIONS": {"MAX_ENTRIES": 500},  # least recently used entries are evicted
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CHART_CACHE_URL", "redis://127.0.0.1:6379"),
+        # eviction is the server's maxmemory-policy, e.g. allkeys-lru
+    },
+}
+
+# voter_analytics can answer filter+aggregate requests from an in-memory
+# NumPy column store ("columnar", needs numpy) instead of SQL ("orm")
+VOTER_ANALYTICS_ENGINE = os.environ.get("VOTER_ANALYTICS_ENGINE", "orm")
+
+# mini_insta feeds: "pull" merges followed profiles' posts at read time,
+# "push" copies each new post into its followers' timelines (TimelineEntry)
+# so reading a feed page is one indexed lookup. Authors with more followers
+# than MINI_INSTA_FANOUT_LIMIT are not pushed; their posts are pulled at
+# read time instead. Timelines keep the newest MINI_INSTA_TIMELINE_LENGTH posts.
+MINI_INSTA_FEED = os.environ.get("MINI_INSTA_FEED", "pull")
+MINI_INSTA_FANOUT_LIMIT = int(os.environ.get("MINI_INSTA_FANOUT_LIMIT", "1000"))
+MINI_INSTA_TIMELINE_LENGTH = 500
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "charts": {
+        **CHART_CACHE_BACKENDS[os.environ.get("CHART_CACHE", "file")],
+        "TIMEOUT": 60 * 60,  # seconds
+    },
+}
+
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATIC_URL = 'static/' # note: no leading slash!
 
@@ -142,6 +193,12 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "static"),
 ]
 
+STATICFILES_FINDERS = [
+    "django.contrib.staticfiles.finders.FileSystemFinder",
+    "django.contrib.staticfiles.finders.AppDirectoriesFinder",
+    "cs412.charts.PlotlyJSFinder",  # plotly/plotly.min.js from the plotly package
+]
+
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
 MEDIA_URL= "media/"  # note: no leading slash!
 
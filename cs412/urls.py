@@ -15,9 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf.urls.static import static
 from django.conf import settings
+from django.views.decorators.cache import cache_control
+from django.views.static import serve
+import os
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -34,5 +37,12 @@ urlpatterns = [
 
 ] 
 
+# plotly.js is requested with a ?v=<plotly version> query string, so it can
+# be cached by browsers "forever"
+urlpatterns += [
+    re_path(r'^%splotly/(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'),
+            cache_control(public=True, max_age=60 * 60 * 24 * 365, immutable=True)(serve),
+            {'document_root': os.path.join(settings.STATIC_ROOT, 'plotly')}),
+]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,10 @@
+# File: loaders/admin.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: File containing model registration
+
+from django.contrib import admin
+from .models import *
+
+# Register your models here.
+
+admin.site.register(RejectedRow)
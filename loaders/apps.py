@@ -0,0 +1,10 @@
+# File: loaders/apps.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: app configuration for the shared CSV loaders
+
+from django.apps import AppConfig
+
+
+class LoadersConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "loaders"
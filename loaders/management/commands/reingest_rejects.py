@@ -0,0 +1,48 @@
+# File: loaders/management/commands/reingest_rejects.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: manage.py command to load quarantined rows again
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from loaders.models import RejectedRow
+from loaders.schema import SCHEMAS
+
+
+class Command(BaseCommand):
+    '''Run the quarantined rows of one source through its Schema again.'''
+
+    help = ("Load RejectedRow entries for a source (e.g. after fixing them in the admin, or "
+            "after a converter fix). Rows that now convert are inserted and removed from "
+            "quarantine; the others keep their updated reason.")
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('source', help="which loader's rejects to retry")
+        parser.add_argument('--dry-run', action='store_true', help="only report what would be loaded")
+
+    def handle(self, *args, **options):
+        '''convert every quarantined row of the source in one chunk'''
+
+        schema = SCHEMAS.get(options['source'])
+        if schema is None:
+            raise CommandError(f"unknown source {options['source']!r}; choose from {', '.join(sorted(SCHEMAS))}")
+
+        rejected = list(RejectedRow.objects.filter(source=schema.name))
+        instances, rejects = schema.instances([row.fields for row in rejected])
+        reasons = dict(rejects)
+        loaded = [row.pk for i, row in enumerate(rejected) if i not in reasons]
+
+        if not options['dry_run']:
+            with transaction.atomic():
+                schema.insert(instances)
+                RejectedRow.objects.filter(pk__in=loaded).delete()
+                for i, reason in reasons.items():
+                    rejected[i].reason = reason
+                RejectedRow.objects.bulk_update([rejected[i] for i in reasons], ['reason'])
+                if instances and schema.after_reingest:
+                    schema.after_reingest()
+
+        self.stdout.write(f"{'Would load' if options['dry_run'] else 'Loaded'} {len(instances)} "
+                          f"{schema.name} rows; {len(rejects)} still rejected")
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="RejectedRow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=30)),
+                ("filename", models.TextField()),
+                ("line", models.IntegerField()),
+                ("reason", models.TextField()),
+                ("fields", models.JSONField()),
+                ("created", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["source", "line"],
+                "indexes": [
+                    models.Index(
+                        fields=["source", "line"], name="rejected_source_line_idx"
+                    )
+                ],
+            },
+        ),
+    ]
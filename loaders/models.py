@@ -0,0 +1,29 @@
+# File: loaders/models.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: quarantine table for CSV rows the loaders could not convert
+
+from django.db import models
+
+
+class RejectedRow(models.Model):
+    '''
+    A row of a data file that failed its Schema, kept with the reason so it
+    can be fixed (e.g. in the admin) and loaded again with
+    manage.py reingest_rejects.
+    '''
+
+    # Schema.name of the loader, e.g. 'voters' or 'results'
+    source = models.CharField(max_length=30)
+    filename = models.TextField()
+    line = models.IntegerField()
+    reason = models.TextField()
+    fields = models.JSONField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['source', 'line']
+        indexes = [models.Index(fields=['source', 'line'], name='rejected_source_line_idx')]
+
+    def __str__(self):
+        '''Return a string representation of this model instance.'''
+        return f'{self.source} line {self.line}: {self.reason}'
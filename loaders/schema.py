@@ -0,0 +1,152 @@
+# File: loaders/schema.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: column schemas and typed converters shared by the CSV loaders
+
+from datetime import date
+
+from django.utils import dateparse
+
+from .models import RejectedRow
+
+# typed converters for CSV text; all raise ValueError on bad input
+parse_int = int
+parse_date = date.fromisoformat
+
+
+def parse_time(value):
+    '''convert 'H:MM:SS' or 'HH:MM:SS' (optionally with a fraction of a
+    second) to a time, accepting what a TimeField does'''
+
+    parsed = dateparse.parse_time(value)
+    if parsed is None:
+        raise ValueError(f'invalid time {value!r}')
+    return parsed
+
+
+def parse_seconds(value):
+    '''convert 'H:MM:SS' (a duration or a time of day) to whole seconds,
+    rounded; accepts exactly what parse_time does'''
+
+    t = parse_time(value)
+    return round((t.hour * 60 + t.minute) * 60 + t.second + t.microsecond / 1e6)
+
+
+# every Schema by name, for reingest_rejects
+SCHEMAS = {}
+
+
+class Column:
+    '''One CSV column: its position in the row, the model field it fills,
+    and the converter applied to it (None keeps the text as is).'''
+
+    def __init__(self, field, index, convert=None):
+        self.field = field
+        self.index = index
+        self.convert = convert
+
+
+class Schema:
+    '''
+    How the rows of a CSV file map onto a model. Rows are converted a chunk
+    at a time, one column at a time: each converter is mapped over the whole
+    column, and only a column that fails is gone through value by value to
+    find the bad rows. Clean chunks therefore pay no per-row error handling.
+
+    derived is a list of (field, function(row)) for values computed from the
+    raw row, such as a hash or a combination of columns. insert(instances)
+    writes the rows reingest_rejects loaded (default: bulk_create), e.g. an
+    upsert for a model whose rows may already be in the table.
+    after_reingest, if given, is called once rows have been loaded by
+    reingest_rejects, e.g. to rebuild summaries.
+    '''
+
+    def __init__(self, name, model, columns, derived=(), insert=None, after_reingest=None):
+        self.name = name
+        self.model = model
+        self.columns = columns
+        self.derived = list(derived)
+        self.insert = insert or model.objects.bulk_create
+        self.after_reingest = after_reingest
+        self.width = max(column.index for column in columns) + 1
+        SCHEMAS[name] = self
+
+    def convert(self, rows):
+        '''Convert a chunk of rows (lists of strings). Returns (loaded,
+        rejects): (position, dict of field values) for each good row and
+        (position, reason) for each bad one, positions being indexes into rows.'''
+
+        reasons = {}
+        for i, fields in enumerate(rows):
+            if len(fields) < self.width:
+                reasons[i] = f'expected {self.width} fields, found {len(fields)}'
+        good = [i for i in range(len(rows)) if i not in reasons]
+        good_rows = [rows[i] for i in good] if reasons else rows
+        # transpose the chunk into columns
+        columns = list(zip(*good_rows)) if good_rows else [()] * self.width
+
+        values = {}
+        for column in self.columns:
+            raw = columns[column.index]
+            values[column.field] = raw if column.convert is None else _map(column.convert, raw, good, column.field, reasons)
+        for field, derive in self.derived:
+            values[field] = _map(derive, good_rows, good, field, reasons)
+
+        names = list(values)
+        loaded = [(i, dict(zip(names, row))) for i, row in zip(good, zip(*values.values()))]
+        if reasons:
+            loaded = [(i, row) for i, row in loaded if i not in reasons]
+        return loaded, sorted(reasons.items())
+
+    def instances(self, rows):
+        '''like convert, returning unsaved model instances instead of dicts'''
+
+        loaded, rejects = self.convert(rows)
+        return [self.model(**values) for i, values in loaded], rejects
+
+
+def _map(convert, raw, positions, field, reasons):
+    '''apply convert to a column, recording a reason for each value that fails'''
+
+    try:
+        return list(map(convert, raw))
+    except (ValueError, TypeError, IndexError):
+        pass
+
+    # slow path, only for a column holding a bad value
+    converted = []
+    for i, value in zip(positions, raw):
+        try:
+            converted.append(convert(value))
+        except (ValueError, TypeError, IndexError) as e:
+            converted.append(None)
+            reasons.setdefault(i, f'{field}: {e}')
+    return converted
+
+
+class Quarantine:
+    '''
+    Collects the rejected rows of one load and saves them as RejectedRow.
+    The first flush replaces whatever an earlier load of the same source
+    left in quarantine, unless clear is False (a resumed load).
+    '''
+
+    def __init__(self, source, filename, clear=True):
+        self.source = source
+        self.filename = str(filename)
+        self.cleared = not clear
+        self.pending = []
+
+    def add(self, line, reason, fields):
+        '''queue one rejected row'''
+
+        self.pending.append(RejectedRow(source=self.source, filename=self.filename,
+                                        line=line, reason=reason, fields=list(fields)))
+
+    def flush(self):
+        '''save the queued rows'''
+
+        if not self.cleared:
+            RejectedRow.objects.filter(source=self.source).delete()
+            self.cleared = True
+        RejectedRow.objects.bulk_create(self.pending)
+        self.pending = []
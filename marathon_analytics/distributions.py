@@ -0,0 +1,114 @@
+# File: marathon_analytics/distributions.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: in-memory finish-time distributions for the race, answering
+# percentile, histogram and negative-split questions without queries
+
+from bisect import bisect_right
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional; sorted lists and bisect are used without it
+    np = None
+
+from cs412.charts import dataset_version
+from .models import Result
+
+# width of a histogram bin
+BIN_SECONDS = 5 * 60
+
+
+class RaceTimes:
+    '''
+    Sorted finish times (in seconds) for the whole field, for each gender
+    and for each division (gender and age group), plus how many runners in
+    each group ran a negative split. A percentile is then a binary search
+    in the group's sorted times instead of a COUNT query.
+    '''
+
+    def __init__(self, version=None):
+        self.version = version
+        groups = {}
+        negative = Counter()
+        for gender, division, finish, half1, half2 in Result.objects.values_list(
+                'gender', 'division', 'time_finish_seconds', 'time_half1_seconds', 'time_half2_seconds').iterator():
+            for key in self.keys(gender, division):
+                groups.setdefault(key, []).append(finish)
+                if half2 < half1:
+                    negative[key] += 1
+
+        if np is not None:
+            self.finishes = {key: np.sort(np.array(times, dtype=np.int32)) for key, times in groups.items()}
+        else:
+            self.finishes = {key: sorted(times) for key, times in groups.items()}
+        self.negative_splits = dict(negative)
+
+    @staticmethod
+    def keys(gender, division):
+        '''the groups a runner belongs to: everyone, their gender, their division'''
+
+        return ['all', ('gender', gender), ('division', gender, division)]
+
+    def size(self, key):
+        '''number of runners in a group'''
+
+        return len(self.finishes.get(key, ()))
+
+    def faster_than(self, seconds, key='all'):
+        '''percentage of the runners in a group who finished slower than seconds'''
+
+        times = self.finishes.get(key)
+        if times is None or not len(times):
+            return 0.0
+        if np is not None:
+            slower = len(times) - int(np.searchsorted(times, seconds, side='right'))
+        else:
+            slower = len(times) - bisect_right(times, seconds)
+        return 100.0 * slower / len(times)
+
+    def percentiles(self, result):
+        '''faster_than for a Result in each of its groups, as
+        [(group label, percentage, group size)]'''
+
+        labels = ['everyone', result.gender, f'{result.gender} {result.division}']
+        return [(label, self.faster_than(result.time_finish_seconds, key), self.size(key))
+                for label, key in zip(labels, self.keys(result.gender, result.division))]
+
+    def histogram(self, key):
+        '''(bin start seconds, count) pairs for a group, in BIN_SECONDS bins'''
+
+        times = self.finishes.get(key)
+        if times is None or not len(times):
+            return []
+        if np is not None:
+            bins = times // BIN_SECONDS
+            low = int(bins[0])
+            return [((low + i) * BIN_SECONDS, int(n)) for i, n in enumerate(np.bincount(bins - low)) if n]
+        counts = Counter(t // BIN_SECONDS for t in times)
+        return [(b * BIN_SECONDS, counts[b]) for b in sorted(counts)]
+
+    def negative_split_rate(self, key):
+        '''percentage of a group whose second half was faster than the first'''
+
+        size = self.size(key)
+        return 100.0 * self.negative_splits.get(key, 0) / size if size else 0.0
+
+    def groups(self, kind):
+        '''the keys of one kind of group ('gender' or 'division'), sorted'''
+
+        return sorted(key for key in self.finishes if key != 'all' and key[0] == kind)
+
+
+# one RaceTimes per process, replaced when the results are reloaded
+_race_times = None
+
+
+def race_times():
+    '''return this process's RaceTimes, rebuilding it if the results have
+    been reloaded since it was built'''
+
+    global _race_times
+    version = dataset_version('results')['version']
+    if _race_times is None or _race_times.version != version:
+        _race_times = RaceTimes(version)
+    return _race_times
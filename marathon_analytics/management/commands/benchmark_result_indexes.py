@@ -0,0 +1,124 @@
+# File: marathon_analytics/management/commands/benchmark_result_indexes.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: compare query plans and latency of the marathon timing and
+# city queries with and without the Result indexes, on a generated field
+
+import random
+import statistics
+import time
+from datetime import time as time_of_day
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from marathon_analytics.models import Result
+
+CITIES = ['Chicago', 'Evanston', 'Naperville', 'Oak Park', 'Boston', 'New York', 'Mexico City', 'London']
+
+# a runner in the middle of the generated field: started 7:45:00, finished 12:00:00
+START, FINISH = 7 * 3600 + 45 * 60, 12 * 3600
+
+# queries to time, by name
+QUERIES = {
+    'city': lambda: Result.objects.filter(city='Evanston'),
+    'finish between 3:00 and 3:05': lambda: Result.objects.filter(time_finish_seconds__range=(3 * 3600, 3 * 3600 + 300)),
+    'finished 11:55-12:00': lambda: Result.objects.filter(finish_seconds__range=(FINISH - 300, FINISH)),
+    'runners passed': lambda: Result.objects.filter(start_seconds__lt=START, finish_seconds__gt=FINISH),
+    'runners passed by': lambda: Result.objects.filter(start_seconds__gt=START, finish_seconds__lt=FINISH),
+}
+
+
+def as_time(seconds):
+    '''seconds since midnight (or a duration) as a time'''
+
+    return time_of_day(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
+
+def generate_results(n, batch_size=10000):
+    '''fill the (empty) benchmark database with a field of n random runners,
+    starting in waves over an hour like the Chicago Marathon'''
+
+    rng = random.Random(412)
+    batch = []
+    for i in range(n):
+        start = 7 * 3600 + 30 * 60 + rng.randint(0, 3600)
+        half1 = int(rng.gauss(2 * 3600 + 600, 1200))
+        half2 = int(half1 * rng.uniform(0.9, 1.25))
+        finish = half1 + half2
+        batch.append(Result(
+            bib=i, first_name=f'First{i}', last_name=f'Last{i}', ctz='USA',
+            city=rng.choice(CITIES), state='IL',
+            gender=rng.choice(['M', 'F']), division='M25-29',
+            place_overall=i, place_gender=i, place_division=i,
+            start_time_of_day=as_time(start), finish_time_of_day=as_time(start + finish),
+            time_finish=as_time(finish), time_half1=as_time(half1), time_half2=as_time(half2),
+            start_seconds=start, finish_seconds=start + finish,
+            time_finish_seconds=finish, time_half1_seconds=half1, time_half2_seconds=half2,
+        ))
+        if len(batch) >= batch_size:
+            Result.objects.bulk_create(batch)
+            batch = []
+    Result.objects.bulk_create(batch)
+
+
+def time_query(qs, repeat):
+    '''return the median time in ms to count the matches and fetch the first page'''
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        qs.count()
+        list(qs.order_by('pk')[:25])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    '''Benchmark the marathon timing queries before and after adding indexes.'''
+
+    help = "Benchmark Result timing and city queries with and without indexes on a generated field (uses a throwaway test database)."
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('--rows', type=int, default=48000, help="number of runners to generate (Chicago 2023 had about 48,000)")
+        parser.add_argument('--repeat', type=int, default=5, help="runs per query (median is reported)")
+
+    def handle(self, *args, **options):
+        '''create a test database, fill it and time each query twice'''
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Generating {options['rows']} results...")
+            generate_results(options['rows'])
+
+            with connection.schema_editor() as editor:
+                for index in Result._meta.indexes:
+                    editor.remove_index(Result, index)
+            before = self.run_queries('without indexes', options['repeat'])
+
+            with connection.schema_editor() as editor:
+                for index in Result._meta.indexes:
+                    editor.add_index(Result, index)
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            after = self.run_queries('with indexes', options['repeat'])
+
+            self.stdout.write('\nSummary (median ms, before -> after):')
+            for name in QUERIES:
+                self.stdout.write(f'  {before[name]:8.1f} -> {after[name]:8.1f}  {name}')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_queries(self, label, repeat):
+        '''print the plan and latency of every query, returning the timings'''
+
+        self.stdout.write(f'\n=== {label} ===')
+        timings = {}
+        for name, query in QUERIES.items():
+            qs = query()
+            timings[name] = time_query(qs, repeat)
+            self.stdout.write(f'\n{name}: {timings[name]:.1f} ms')
+            self.stdout.write(qs.explain())
+        return timings
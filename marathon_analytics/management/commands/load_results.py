@@ -0,0 +1,29 @@
+# File: marathon_analytics/management/commands/load_results.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: manage.py command to (re)load a marathon results file into the database
+
+from django.core.management.base import BaseCommand
+from marathon_analytics.models import load_data, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    '''Stream a results CSV file into the Result table in batches.'''
+
+    help = "Load marathon results from a CSV file using batched bulk inserts."
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('path', help="results CSV file, e.g. 2023_chicago_results.csv")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f"rows per bulk insert (default: {BATCH_SIZE})")
+        parser.add_argument('--errors', metavar='FILE',
+                            help="write rejected rows and the reason to this CSV file")
+
+    def handle(self, *args, **options):
+        '''run the loader, reporting progress on stdout'''
+
+        load_data(filename=options['path'],
+                  batch_size=options['batch_size'],
+                  error_file=options['errors'],
+                  report=self.stdout.write)
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:59
+
+from django.db import migrations, models
+
+from marathon_analytics.passing import count_passes
+
+
+def fill_runners_passed(apps, schema_editor):
+    """Compute the passing counts for results already loaded."""
+    Result = apps.get_model("marathon_analytics", "Result")
+    results = list(Result.objects.only("pk", "start_time_of_day", "finish_time_of_day"))
+    counts = count_passes(
+        [(r.pk, r.start_time_of_day, r.finish_time_of_day) for r in results]
+    )
+    for r in results:
+        r.runners_passed, r.runners_passed_by = counts[r.pk]
+    Result.objects.bulk_update(
+        results, ["runners_passed", "runners_passed_by"], batch_size=5000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("marathon_analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="result",
+            name="runners_passed",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="runners_passed_by",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_runners_passed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+SECONDS_FIELDS = {
+    "start_seconds": "start_time_of_day",
+    "finish_seconds": "finish_time_of_day",
+    "time_finish_seconds": "time_finish",
+    "time_half1_seconds": "time_half1",
+    "time_half2_seconds": "time_half2",
+}
+
+
+def fill_seconds(apps, schema_editor):
+    """Copy the existing TimeFields into the seconds columns."""
+    Result = apps.get_model("marathon_analytics", "Result")
+    results = list(Result.objects.all())
+    for r in results:
+        for field, source in SECONDS_FIELDS.items():
+            t = getattr(r, source)
+            seconds = (t.hour * 60 + t.minute) * 60 + t.second + t.microsecond / 1e6
+            setattr(r, field, round(seconds))
+    Result.objects.bulk_update(results, list(SECONDS_FIELDS), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("marathon_analytics", "0002_result_runners_passed"),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name="result",
+                name=field,
+                field=models.IntegerField(null=True),
+            )
+            for field in SECONDS_FIELDS
+        ],
+        migrations.RunPython(fill_seconds, migrations.RunPython.noop),
+        *[
+            migrations.AlterField(
+                model_name="result",
+                name=field,
+                field=models.IntegerField(),
+            )
+            for field in SECONDS_FIELDS
+        ],
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(
+                fields=["start_seconds", "finish_seconds"],
+                name="result_start_finish_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(fields=["finish_seconds"], name="result_finish_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(
+                fields=["time_finish_seconds"], name="result_time_finish_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(fields=["city"], name="result_city_idx"),
+        ),
+    ]
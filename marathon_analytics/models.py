@@ -1,4 +1,10 @@
-from django.db import models
+import csv
+import time
+
+from django.db import models, transaction
+from cs412.charts import bump_dataset_version
+from loaders.schema import Column, Quarantine, Schema, parse_int, parse_seconds, parse_time
+from .passing import count_passes
 
 # Create your models here.
 class Result(models.Model):
@@ -31,70 +37,187 @@ class Result(models.Model):
     time_finish = models.TimeField()
     time_half1 = models.TimeField()
     time_half2 = models.TimeField()
+
+    # the times above in whole seconds (since midnight for the times of
+    # day), for indexed range queries and arithmetic
+    start_seconds = models.IntegerField()
+    finish_seconds = models.IntegerField()
+    time_finish_seconds = models.IntegerField()
+    time_half1_seconds = models.IntegerField()
+    time_half2_seconds = models.IntegerField()
+
+    # precomputed for the whole field by update_runners_passed(); empty
+    # until then
+    runners_passed = models.IntegerField(null=True, blank=True)
+    runners_passed_by = models.IntegerField(null=True, blank=True)
  
+    class Meta:
+        indexes = [
+            # who started before/after a runner and finished after/before them
+            models.Index(fields=['start_seconds', 'finish_seconds'], name='result_start_finish_idx'),
+            models.Index(fields=['finish_seconds'], name='result_finish_idx'),
+            # finishing-time ranges and rankings
+            models.Index(fields=['time_finish_seconds'], name='result_time_finish_idx'),
+            models.Index(fields=['city'], name='result_city_idx'),
+        ]
+
     def __str__(self):
         '''Return a string representation of this model instance.'''
         return f'{self.first_name} {self.last_name} ({self.city}, {self.state}), {self.time_finish}'
 
     def get_runners_passed(self):
         '''Return the number of runners passed by this runner.'''
-        started_first = Result.objects.filter(start_time_of_day__lt=self.start_time_of_day)
-        passed = started_first.filter(finish_time_of_day__gt=self.finish_time_of_day)
+        if self.runners_passed is not None:
+            return self.runners_passed
+
+        started_first = Result.objects.filter(start_seconds__lt=self.start_seconds)
+        passed = started_first.filter(finish_seconds__gt=self.finish_seconds)
  
-        return len(passed)
+        return passed.count()
         
     def get_runners_passed_by(self):
         '''Return the number of runners who passed this runner.'''
-        started_later = Result.objects.filter(start_time_of_day__gt=self.start_time_of_day)
-        passed_by = started_later.filter(finish_time_of_day__lt=self.finish_time_of_day)
+        if self.runners_passed_by is not None:
+            return self.runners_passed_by
+
+        started_later = Result.objects.filter(start_seconds__gt=self.start_seconds)
+        passed_by = started_later.filter(finish_seconds__lt=self.finish_seconds)
  
-        return len(passed_by)
+        return passed_by.count()
+
+
+def update_runners_passed():
+    '''Compute runners_passed/runners_passed_by for every Result in one pass
+    (see passing.count_passes) and save them with bulk updates.'''
+
+    results = list(Result.objects.only('pk', 'start_seconds', 'finish_seconds'))
+    counts = count_passes([(r.pk, r.start_seconds, r.finish_seconds) for r in results])
+    for r in results:
+        r.runners_passed, r.runners_passed_by = counts[r.pk]
+    Result.objects.bulk_update(results, ['runners_passed', 'runners_passed_by'], batch_size=5000)
  
 
-def load_data():
-    '''Function to load data records from CSV file into Django model instances.'''
-
-    Result.objects.all().delete()
-
-    filename = '/Users/zach/Downloads/2023_chicago_results.csv'
-    f = open(filename, 'r')
-    f.readline() # discard headers
-
-    # for row in range(5):
-        # line = f.readline().strip()
-
-    for line in f:
-
-        try:
-            fields = line.strip().split(',')
-            # show which value in each field
-                    
-            # create a new instance of Result object with this record from CSV
-            result = Result(bib=fields[0],
-                            first_name=fields[1],
-                            last_name=fields[2],
-                            ctz = fields[3],
-                            city = fields[4],
-                            state = fields[5],
-                            
-                            gender = fields[6],
-                            division = fields[7],
-
-                            place_overall = fields[8],
-                            place_gender = fields[9],
-                            place_division = fields[10],
-                        
-                            start_time_of_day = fields[11],
-                            finish_time_of_day = fields[12],
-                            time_finish = fields[13],
-                            time_half1 = fields[14],
-                            time_half2 = fields[15],
-                        )
-            result.save() # commit this
-            print(f'Created result: {result}')
-
-        except:
-            print("Something went wrong!")
-            print(f"line={line}")
-
-    print(f"Created {len(Result.object.all())} Results")
+def _after_result_reingest():
+    '''new runners change everyone's passing counts'''
+
+    update_runners_passed()
+    bump_dataset_version('results')
+
+
+# layout of the results CSV file (see Result)
+RESULT_SCHEMA = Schema('results', Result, [
+    Column('bib', 0, parse_int),
+    Column('first_name', 1),
+    Column('last_name', 2),
+    Column('ctz', 3),
+    Column('city', 4),
+    Column('state', 5),
+    Column('gender', 6),
+    Column('division', 7),
+    Column('place_overall', 8, parse_int),
+    Column('place_gender', 9, parse_int),
+    Column('place_division', 10, parse_int),
+    Column('start_time_of_day', 11, parse_time),
+    Column('finish_time_of_day', 12, parse_time),
+    Column('time_finish', 13, parse_time),
+    Column('time_half1', 14, parse_time),
+    Column('time_half2', 15, parse_time),
+    Column('start_seconds', 11, parse_seconds),
+    Column('finish_seconds', 12, parse_seconds),
+    Column('time_finish_seconds', 13, parse_seconds),
+    Column('time_half1_seconds', 14, parse_seconds),
+    Column('time_half2_seconds', 15, parse_seconds),
+], after_reingest=_after_result_reingest)
+
+# rows converted and written per INSERT
+BATCH_SIZE = 5000
+
+
+def read_results(f, batch_size, reject):
+    '''Yield lists of at most batch_size Results parsed from an open CSV
+    file. Rows that do not fit RESULT_SCHEMA are passed to
+    reject(line_number, reason, fields) instead.'''
+
+    reader = csv.reader(f)
+    next(reader, None) # discard headers
+
+    rows = []
+    lines = []
+    for fields in reader:
+        rows.append(fields)
+        lines.append(reader.line_num)
+        if len(rows) >= batch_size:
+            yield _convert_batch(rows, lines, reject)
+            rows = []
+            lines = []
+    if rows:
+        yield _convert_batch(rows, lines, reject)
+
+
+def _convert_batch(rows, lines, reject):
+    '''convert a batch of CSV rows into Results, rejecting the bad ones'''
+
+    results, rejects = RESULT_SCHEMA.instances(rows)
+    for i, reason in rejects:
+        reject(lines[i], reason, rows[i])
+    return results
+
+
+def load_data(filename, batch_size=BATCH_SIZE, error_file=None, report=print):
+    '''Function to load data records from CSV file into the Django database.
+
+    Every Result is replaced, inside one transaction. The file is streamed
+    and converted in batches, and the passing counts are computed from the
+    parsed field before anything is written, so each runner is inserted
+    once, complete, with bulk INSERTs of batch_size rows. Rows that do not
+    fit RESULT_SCHEMA are quarantined as RejectedRow and, if error_file is
+    given, written there with the reason. Returns a dict of row counts.'''
+
+    stats = {'inserted': 0, 'rejected': 0}
+    start = time.monotonic()
+    quarantine = Quarantine(RESULT_SCHEMA.name, filename)
+
+    errors_f = None
+    errors = None
+    if error_file:
+        errors_f = open(error_file, 'w', newline='')
+        errors = csv.writer(errors_f)
+        errors.writerow(['line', 'error', 'fields'])
+
+    def reject(line_num, reason, fields):
+        '''count (and report) a row that could not be converted'''
+        stats['rejected'] += 1
+        quarantine.add(line_num, reason, fields)
+        if errors:
+            errors.writerow([line_num, reason] + fields)
+
+    try:
+        # the whole field is needed for the passing counts; a race of ~50k
+        # runners fits in memory easily
+        results = []
+        with open(filename, 'r', newline='') as f:
+            for batch in read_results(f, batch_size, reject):
+                results.extend(batch)
+                report(f"Read {len(results)} results, rejected {stats['rejected']}")
+    finally:
+        if errors_f:
+            errors_f.close()
+
+    counts = count_passes([(i, r.start_seconds, r.finish_seconds) for i, r in enumerate(results)])
+    for i, r in enumerate(results):
+        r.runners_passed, r.runners_passed_by = counts[i]
+
+    with transaction.atomic():
+        Result.objects.all().delete()
+        for i in range(0, len(results), batch_size):
+            Result.objects.bulk_create(results[i:i + batch_size])
+            stats['inserted'] += len(results[i:i + batch_size])
+            report(f"Inserted {stats['inserted']} of {len(results)} results")
+        quarantine.flush()
+
+    # charts rendered from the old results are stale now
+    bump_dataset_version('results')
+
+    report(f"Created {Result.objects.count()} Results, rejected {stats['rejected']} rows "
+           f"in {time.monotonic() - start:.1f}s")
+    return stats
@@ -0,0 +1,69 @@
+# File: marathon_analytics/passing.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: count, for every runner in a race at once, how many runners
+# they passed and how many passed them
+
+from bisect import bisect_right
+
+
+class FenwickTree:
+    '''counts of values at positions 1..n, with O(log n) updates and prefix sums'''
+
+    def __init__(self, n):
+        self.tree = [0] * (n + 1)
+
+    def add(self, i, amount=1):
+        '''add amount at position i'''
+        while i < len(self.tree):
+            self.tree[i] += amount
+            i += i & -i
+
+    def prefix(self, i):
+        '''sum of positions 1..i'''
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+def _sweep(order, finishes):
+    '''Visit runners in order, yielding (key, rank, seen, tree): the rank of
+    their finish among finishes (1-based), how many runners came before them
+    and a Fenwick tree counting those runners by finish rank. Runners with
+    equal start times are all yielded before any of them is counted, since
+    neither passed the other by starting first.'''
+
+    tree = FenwickTree(len(finishes))
+    i = 0
+    while i < len(order):
+        j = i
+        while j < len(order) and order[j][1] == order[i][1]:
+            j += 1
+        ranks = [bisect_right(finishes, finish) for key, start, finish in order[i:j]]
+        for (key, start, finish), rank in zip(order[i:j], ranks):
+            yield key, rank, i, tree
+        for rank in ranks:
+            tree.add(rank)
+        i = j
+
+
+def count_passes(runners):
+    '''
+    Given (key, start, finish) for every runner, return {key: (passed,
+    passed_by)}, where passed counts the runners who started earlier and
+    finished later, and passed_by those who started later and finished
+    earlier. Runners are swept in start order while a Fenwick tree over
+    finish-time ranks counts the finishers seen so far, so the whole field
+    takes O(n log n) instead of two queries per runner.
+    '''
+
+    finishes = sorted({finish for key, start, finish in runners})
+    by_start = sorted(runners, key=lambda runner: runner[1])
+
+    # earlier starters who finished later
+    passed = {key: seen - tree.prefix(rank) for key, rank, seen, tree in _sweep(by_start, finishes)}
+    # later starters who finished earlier
+    passed_by = {key: tree.prefix(rank - 1) for key, rank, seen, tree in _sweep(by_start[::-1], finishes)}
+
+    return {key: (passed[key], passed_by[key]) for key in passed}
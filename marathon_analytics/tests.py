@@ -1,3 +1,158 @@
-from django.test import TestCase
+# File: marathon_analytics/tests.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: tests for marathon_analytics
 
-# Create your tests here.
+import random
+from datetime import time
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from cs412.charts import chart_cache
+from .distributions import RaceTimes
+from .models import RESULT_SCHEMA, Result, update_runners_passed
+from .passing import count_passes
+
+# one row of the results file, with single-digit hours as the file has them
+SAMPLE_ROW = ['1042', 'Jane', 'Doe', 'USA', 'Newton', 'MA', 'F', 'F35-39', '2810', '612', '140',
+              '9:02:34', '12:35:13', '3:32:39', '1:44:10', '1:48:29']
+
+# charts rendered by the tests are kept out of the shared chart cache
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'charts': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'marathon-tests'},
+}
+
+
+def make_result(bib, gender, division, finish, half1, half2, start=SAMPLE_ROW[11], finished=SAMPLE_ROW[12]):
+    '''save a Result like SAMPLE_ROW, with these 'H:MM:SS' times (start and
+    finished being times of day)'''
+
+    row = SAMPLE_ROW[:6] + [gender, division] + SAMPLE_ROW[8:11] + [start, finished, finish, half1, half2]
+    row[0] = str(bib)
+    [result], rejects = RESULT_SCHEMA.instances([row])
+    result.save()
+    return result
+
+
+class ResultSchemaTests(SimpleTestCase):
+    '''RESULT_SCHEMA converts rows of the results file'''
+
+    def test_sample_row(self):
+        '''a real row loads, with times before 10 o'clock parsed'''
+
+        loaded, rejects = RESULT_SCHEMA.convert([SAMPLE_ROW])
+        self.assertEqual(rejects, [])
+        [(i, values)] = loaded
+        self.assertEqual(values['bib'], 1042)
+        self.assertEqual(values['start_time_of_day'], time(9, 2, 34))
+        self.assertEqual(values['time_finish'], time(3, 32, 39))
+        self.assertEqual(values['time_finish_seconds'], 3 * 3600 + 32 * 60 + 39)
+        self.assertEqual(values['time_half1_seconds'] + values['time_half2_seconds'], 12759)
+
+    def test_bad_time_is_rejected(self):
+        '''a time that is not H:MM:SS sends only its row to quarantine'''
+
+        bad = SAMPLE_ROW[:13] + ['DNF'] + SAMPLE_ROW[14:]
+        loaded, rejects = RESULT_SCHEMA.convert([SAMPLE_ROW, bad])
+        self.assertEqual([i for i, values in loaded], [0])
+        self.assertEqual([i for i, reason in rejects], [1])
+        self.assertIn('time_finish', rejects[0][1])
+
+    def test_fractional_seconds(self):
+        '''times with a fraction of a second load, rounded in the seconds columns'''
+
+        row = SAMPLE_ROW[:13] + ['3:32:39.6'] + SAMPLE_ROW[14:]
+        loaded, rejects = RESULT_SCHEMA.convert([row])
+        self.assertEqual(rejects, [])
+        self.assertEqual(loaded[0][1]['time_finish'], time(3, 32, 39, 600000))
+        self.assertEqual(loaded[0][1]['time_finish_seconds'], 3 * 3600 + 32 * 60 + 40)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class RaceTimesTests(TestCase):
+    '''RaceTimes answers percentile, histogram and negative split questions'''
+
+    def setUp(self):
+        chart_cache().clear()
+        make_result(1, 'F', 'F35-39', '3:00:00', '1:31:00', '1:29:00')
+        make_result(2, 'F', 'F35-39', '3:30:00', '1:40:00', '1:50:00')
+        make_result(3, 'M', 'M18-39', '3:02:00', '1:30:00', '1:32:00')
+        make_result(4, 'M', 'M40-44', '4:00:00', '2:01:00', '1:59:00')
+        self.times = RaceTimes()
+
+    def test_faster_than(self):
+        '''the share of a group finishing slower; a tie is not slower'''
+
+        self.assertEqual(self.times.faster_than(3 * 3600), 75.0)
+        self.assertEqual(self.times.faster_than(3 * 3600 + 60), 75.0)
+        self.assertEqual(self.times.faster_than(3 * 3600, ('gender', 'F')), 50.0)
+        self.assertEqual(self.times.faster_than(5 * 3600), 0.0)
+        self.assertEqual(self.times.faster_than(3 * 3600, ('gender', 'X')), 0.0)
+
+    def test_histogram(self):
+        '''finish times counted in BIN_SECONDS bins, empty bins left out'''
+
+        self.assertEqual(self.times.histogram('all'), [(10800, 2), (12600, 1), (14400, 1)])
+        self.assertEqual(self.times.histogram(('division', 'M', 'M18-39')), [(10800, 1)])
+        self.assertEqual(self.times.histogram(('gender', 'X')), [])
+
+    def test_negative_split_rate(self):
+        '''the share of a group whose second half was faster'''
+
+        self.assertEqual(self.times.negative_split_rate('all'), 50.0)
+        self.assertEqual(self.times.negative_split_rate(('gender', 'M')), 50.0)
+        self.assertEqual(self.times.negative_split_rate(('division', 'M', 'M18-39')), 0.0)
+        self.assertEqual(self.times.groups('gender'), [('gender', 'F'), ('gender', 'M')])
+
+    def test_analytics_page(self):
+        '''the page shows the charts and where a runner stands'''
+
+        response = self.client.get(reverse('race_analytics'), {'bib': '3'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.context['graph_div_division'])
+        self.assertEqual(response.context['percentiles'][0], ('everyone', 50.0, 4))
+
+    def test_analytics_page_without_results(self):
+        '''before load_results has run the page renders without charts'''
+
+        Result.objects.all().delete()
+        chart_cache().clear()
+        response = self.client.get(reverse('race_analytics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['graph_div_gender'])
+        self.assertContains(response, 'No results loaded')
+
+
+class PassingTests(TestCase):
+    '''count_passes agrees with the definition of passing'''
+
+    def test_matches_brute_force(self):
+        '''a random field with many tied starts and finishes, checked against
+        comparing every pair of runners'''
+
+        rng = random.Random(412)
+        runners = [(i, rng.randrange(20), rng.randrange(20)) for i in range(300)]
+        expected = {key: (sum(s < start and f > finish for k, s, f in runners),
+                          sum(s > start and f < finish for k, s, f in runners))
+                    for key, start, finish in runners}
+        self.assertEqual(count_passes(runners), expected)
+
+    def test_columns_match_queries(self):
+        '''update_runners_passed saves what get_runners_passed counted with
+        queries while the columns were empty'''
+
+        times = [('9:00:00', '12:30:00'), ('9:00:00', '12:40:00'), ('9:10:00', '12:30:00'),
+                 ('9:20:00', '12:20:00'), ('9:20:00', '12:50:00'), ('9:30:00', '12:40:00')]
+        for bib, (start, finished) in enumerate(times):
+            make_result(bib, 'F', 'F35-39', '3:30:00', '1:45:00', '1:45:00', start=start, finished=finished)
+
+        results = Result.objects.order_by('bib')
+        self.assertIsNone(results[0].runners_passed)
+        queried = [(r.get_runners_passed(), r.get_runners_passed_by()) for r in results]
+        self.assertNotEqual(set(queried), {(0, 0)})
+
+        update_runners_passed()
+        with self.assertNumQueries(1):
+            saved = [(r.get_runners_passed(), r.get_runners_passed_by()) for r in results.all()]
+        self.assertEqual(saved, queried)
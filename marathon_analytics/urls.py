@@ -8,5 +8,6 @@ urlpatterns = [
 	path(r'', views.ResultsListView.as_view(), name='home'),
     path(r'results', views.ResultsListView.as_view(), name='results_list'),
     path(r'result/<int:pk>', views.ResultDetailView.as_view(), name='result_detail'),
+    path(r'analytics', views.RaceAnalyticsView.as_view(), name='race_analytics'),
 ]
  
\ No newline at end of file
@@ -3,9 +3,10 @@ from django.shortcuts import render
 # Create your views here.
 from django.db.models.query import QuerySet
 from django.shortcuts import render
-from django.views.generic import ListView, DetailView
+from django.views.generic import ListView, DetailView, TemplateView
 from . models import Result
-import plotly
+from .distributions import race_times
+from cs412.charts import cached_charts, render_chart
 import plotly.graph_objs as go
 
 class ResultsListView(ListView):
@@ -38,43 +39,117 @@ class ResultDetailView(DetailView):
     model = Result
     context_object_name = 'r' # short for result
 
-    def get_context_data(self, **kwargs) :
+    def render_charts(self, r):
         '''
-        Provide context variables for use in template
+        Render the graphs for result r as HTML divs, along with the
+        passing counts they are built from
         '''
-        # start with superclass context
-        context = super().get_context_data(**kwargs)
-        r = context['r']
- 
         # create graph of first half/second half as pie chart:
         x = ['first half', 'second half']
-        first_half_seconds = (r.time_half1.hour * 60 + r.time_half1.minute) * 60 + r.time_half1.second
-        second_half_seconds = (r.time_half2.hour * 60 + r.time_half2.minute) * 60 + r.time_half2.second
-        y = [first_half_seconds , second_half_seconds]
+        y = [r.time_half1_seconds, r.time_half2_seconds]
         
         # generate the Pie chart
         fig = go.Pie(labels=x, values=y) 
         title_text = f"Half Marathon Splits"
         # obtain the graph as an HTML div"
-        graph_div_splits = plotly.offline.plot({"data": [fig], 
-                                         "layout_title_text": title_text,}, 
-                                         auto_open=False, 
-                                         output_type="div")
-        # send div as template context variable
-        context['graph_div_splits'] = graph_div_splits
+        graph_div_splits = render_chart({"data": [fig], 
+                                         "layout_title_text": title_text,})
 
         # create graph of runners who passed/passed by
+        runners_passed = r.get_runners_passed()
+        runners_passed_by = r.get_runners_passed_by()
         x= [f'Runners Passed by {r.first_name}', f'Runners who Passed {r.first_name}']
-        y = [r.get_runners_passed(), r.get_runners_passed_by()]
+        y = [runners_passed, runners_passed_by]
         
         fig = go.Bar(x=x, y=y)
         title_text = f"Runners Passed/Passed By"
-        graph_div_passed = plotly.offline.plot({"data": [fig], 
-                                         "layout_title_text": title_text,}, 
-                                         auto_open=False, 
-                                         output_type="div",               
-                                         ) 
-        context['graph_div_passed'] = graph_div_passed
+        graph_div_passed = render_chart({"data": [fig], 
+                                         "layout_title_text": title_text,}) 
+
+        return {
+            'graph_div_splits': graph_div_splits,
+            'graph_div_passed': graph_div_passed,
+            'runners_passed': runners_passed,
+            'runners_passed_by': runners_passed_by,
+        }
+
+    def get_context_data(self, **kwargs) :
+        '''
+        Provide context variables for use in template
+        '''
+        # start with superclass context
+        context = super().get_context_data(**kwargs)
+        r = context['r']
+
+        # send divs as template context variables, re-rendered only when
+        # the results are reloaded
+        context.update(cached_charts('result_detail', {'pk': r.pk}, 'results',
+                                     lambda: self.render_charts(r)))
+
+        # "faster than X% of ..." from the in-memory finish times
+        context['percentiles'] = race_times().percentiles(r)
+
+        return context
+
+
+class RaceAnalyticsView(TemplateView):
+    '''View to show finish-time distributions and negative split rates for
+    the whole race, and where one runner (?bib=) stands in them.'''
+
+    template_name = 'marathon_analytics/analytics.html'
+
+    def render_charts(self):
+        '''
+        Render the race-wide histograms as HTML divs, along with the
+        negative split rates per gender and division
+        '''
+        times = race_times()
+
+        def histogram_traces(kind):
+            '''one bar trace per group of this kind, x in hours'''
+            traces = []
+            for key in times.groups(kind):
+                counts = times.histogram(key)
+                traces.append(go.Bar(x=[start / 3600 for start, n in counts],
+                                     y=[n for start, n in counts],
+                                     name=' '.join(key[1:]), opacity=0.6))
+            return traces
+
+        graphs = {}
+        for kind in ['gender', 'division']:
+            # no results loaded yet: no chart (plotly refuses an empty figure)
+            if not times.groups(kind):
+                graphs[f'graph_div_{kind}'] = None
+                continue
+            graphs[f'graph_div_{kind}'] = render_chart({
+                "data": histogram_traces(kind),
+                "layout": {"title": {"text": f"Finish Times by {kind.title()}"},
+                           "barmode": "overlay",
+                           "xaxis": {"title": {"text": "Finish time (hours)"}},
+                           "yaxis": {"title": {"text": "Runners"}}},
+            })
+
+        splits = [(' '.join(key[1:]), times.size(key), times.negative_split_rate(key))
+                  for key in times.groups('gender') + times.groups('division')]
+        return {
+            **graphs,
+            'negative_split_overall': times.negative_split_rate('all'),
+            'negative_splits': splits,
+        }
+
+    def get_context_data(self, **kwargs):
+        '''
+        Provide context variables for use in template
+        '''
+        context = super().get_context_data(**kwargs)
+        context.update(cached_charts('race_analytics', {}, 'results', self.render_charts))
+
+        bib = self.request.GET.get('bib', '')
+        if bib.isdigit():
+            r = Result.objects.filter(bib=int(bib)).first()
+            context['r'] = r
+            if r:
+                context['percentiles'] = race_times().percentiles(r)
+        context['bib'] = bib
 
         return context
- 
\ No newline at end of file
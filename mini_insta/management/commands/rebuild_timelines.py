@@ -0,0 +1,24 @@
+# File: mini_insta/management/commands/rebuild_timelines.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: manage.py command to rebuild the fan-out-on-write feed timelines
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from mini_insta.models import TimelineEntry
+from mini_insta.timeline import rebuild_timelines, timelines_enabled
+
+
+class Command(BaseCommand):
+    '''Refill TimelineEntry from the Follow and Post tables.'''
+
+    help = "Rebuild every mini_insta feed timeline (run after setting MINI_INSTA_FEED=push)."
+
+    def handle(self, *args, **options):
+        '''rebuild all timelines in one transaction'''
+
+        if not timelines_enabled():
+            raise CommandError("MINI_INSTA_FEED is not 'push'; timelines are not used")
+        with transaction.atomic():
+            rebuild_timelines()
+        self.stdout.write(f"Built {TimelineEntry.objects.count()} timeline entries")
@@ -0,0 +1,29 @@
+# File: mini_insta/management/commands/reconcile_counters.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: manage.py command to repair the follower, following, like and
+# comment counters on Profile and Post
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from mini_insta.models import reconcile_counters
+
+
+class Command(BaseCommand):
+    '''Reset every counter column that disagrees with the rows it counts.'''
+
+    help = "Repair drifted Profile/Post counters (e.g. after edits in the admin)."
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('--dry-run', action='store_true', help="only report the counters that are off")
+
+    def handle(self, *args, **options):
+        '''reconcile the counters in one transaction and report what was off'''
+
+        with transaction.atomic():
+            drift = reconcile_counters(dry_run=options['dry_run'])
+        verb = "off" if options['dry_run'] else "fixed"
+        for counter, n in drift.items():
+            self.stdout.write(f"{counter}: {n} {verb}")
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:07
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# (model, counter field, counted model, its foreign key), as in models.COUNTERS
+COUNTERS = [
+    ("Profile", "num_followers", "Follow", "profile"),
+    ("Profile", "num_following", "Follow", "follower_profile"),
+    ("Post", "num_likes", "Like", "post"),
+    ("Post", "num_comments", "Comment", "post"),
+]
+
+
+def fill_counters(apps, schema_editor):
+    """Set every counter from the rows it counts."""
+    for model, field, counted, key in COUNTERS:
+        Model = apps.get_model("mini_insta", model)
+        Counted = apps.get_model("mini_insta", counted)
+        counts = (
+            Counted.objects.filter(**{key: OuterRef("pk")})
+            .order_by()
+            .values(key)
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        Model.objects.update(**{field: Coalesce(Subquery(counts), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mini_insta", "0007_timelineentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="num_comments",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="num_likes",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="num_followers",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="num_following",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
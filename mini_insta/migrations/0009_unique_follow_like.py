@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:08
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicates(apps, schema_editor):
+    """Keep the oldest of each duplicated Follow/Like and recount the
+    counters the duplicates inflated."""
+    Profile = apps.get_model("mini_insta", "Profile")
+    Post = apps.get_model("mini_insta", "Post")
+    Follow = apps.get_model("mini_insta", "Follow")
+    Like = apps.get_model("mini_insta", "Like")
+
+    for model, fields in [
+        (Follow, ("follower_profile", "profile")),
+        (Like, ("profile", "post")),
+    ]:
+        keep = model.objects.values(*fields).annotate(keep=Min("pk")).values("keep")
+        model.objects.exclude(pk__in=keep).delete()
+
+    for Model, field, Counted, key in [
+        (Profile, "num_followers", Follow, "profile"),
+        (Profile, "num_following", Follow, "follower_profile"),
+        (Post, "num_likes", Like, "post"),
+    ]:
+        counts = (
+            Counted.objects.filter(**{key: OuterRef("pk")})
+            .order_by()
+            .values(key)
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        Model.objects.update(**{field: Coalesce(Subquery(counts), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mini_insta", "0008_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="follow",
+            constraint=models.UniqueConstraint(
+                fields=("follower_profile", "profile"), name="follow_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="like",
+            constraint=models.UniqueConstraint(
+                fields=("profile", "post"), name="like_unique"
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
 # File: mini_insta/models.py
 # Author: Zacharie Verdieu (zverdieu@bu.edu), 9/25/2025
 # Description: File creating models for mini_insta
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.contrib.auth.models import User
 
@@ -17,6 +19,9 @@ class Profile(models.Model):
     bio_text = models.TextField(blank=True)
     join_date = models.DateTimeField(auto_now=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # counters kept up to date by follow/unfollow (see reconcile_counters)
+    num_followers = models.PositiveIntegerField(default=0)
+    num_following = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         '''return a string representation of this model instance'''
@@ -37,7 +42,7 @@ class Profile(models.Model):
     def get_followers(self):
         '''return a list of Profiles who follow this Profile'''
 
-        follower_set = Follow.objects.filter(profile=self)
+        follower_set = Follow.objects.filter(profile=self).select_related('follower_profile').order_by('pk')
 
         followers = []
         for i in follower_set:
@@ -48,13 +53,12 @@ class Profile(models.Model):
     def get_num_followers(self):
         '''return the number of Profiles who follow this Profile'''
 
-        followers = self.get_followers()
-        return len(followers)
+        return self.num_followers
 
     def get_following(self):
         '''return a list of Profiles who this Profile is following'''
 
-        follower_set = Follow.objects.filter(follower_profile=self)
+        follower_set = Follow.objects.filter(follower_profile=self).select_related('profile').order_by('pk')
 
         following = []
         for i in follower_set:
@@ -65,19 +69,64 @@ class Profile(models.Model):
     def get_num_following(self):
         '''return the number of Profiles who this Profile is followin'''
 
-        following = self.get_following()
-        return len(following)
+        return self.num_following
+
+    def follow(self, profile):
+        '''make this Profile follow profile, updating both counters in the
+        same transaction; does nothing if it already does. Returns True if
+        a Follow was created.'''
+
+        with transaction.atomic():
+            follow, created = Follow.objects.get_or_create(follower_profile=self, profile=profile)
+            if created:
+                Profile.objects.filter(pk=self.pk).update(num_following=F('num_following') + 1)
+                Profile.objects.filter(pk=profile.pk).update(num_followers=F('num_followers') + 1)
+        return created
+
+    def unfollow(self, profile):
+        '''stop this Profile following profile, updating both counters in
+        the same transaction. Returns True if there was a Follow to delete.'''
+
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(follower_profile=self, profile=profile).delete()
+            if deleted:
+                Profile.objects.filter(pk=self.pk).update(num_following=F('num_following') - deleted)
+                Profile.objects.filter(pk=profile.pk).update(num_followers=F('num_followers') - deleted)
+        return bool(deleted)
 
     def get_post_feed(self):
-        '''return a list of posts made by profiles followed by this profile'''
+        '''return a QuerySet of posts made by profiles followed by this
+        profile, newest first, as one JOINed query with photos, comments
+        and the first liker loaded alongside (see PostQuerySet.with_feed_details)'''
+
+        following = Follow.objects.filter(follower_profile=self).values('profile')
+        posts = Post.objects.filter(profile__in=following).with_feed_details()
+        return posts.order_by('-timestamp', '-pk')
+
+
+class PostQuerySet(models.QuerySet):
+    '''QuerySet of Posts with helpers for pages that list many posts'''
+
+    def with_feed_details(self):
+        '''load everything a post card shows in a fixed number of queries,
+        however many posts there are: the author (JOINed), the first liker's
+        username (annotated), and the photos and comments with their authors
+        (prefetched into post.photos and post.comments)'''
 
-        posts = []
-        for profile in self.get_following():
-            for post in profile.get_all_posts():
-                posts.append(post)
+        first_liker = Like.objects.filter(post=models.OuterRef('pk')).order_by('pk')
+        return (self.select_related('profile')
+                    .with_photos()
+                    .annotate(first_liker=models.Subquery(first_liker.values('profile__username')[:1]))
+                    .prefetch_related(
+                        models.Prefetch('comment_set', queryset=Comment.objects.select_related('profile').order_by('pk'),
+                                        to_attr='comments'),
+                    ))
 
-        posts_sorted = sorted(posts, key=lambda p: p.timestamp, reverse=True)
-        return posts_sorted
+    def with_photos(self):
+        '''prefetch each post's photos into post.photos, in one query'''
+
+        return self.prefetch_related(
+            models.Prefetch('photo_set', queryset=Photo.objects.order_by('pk'), to_attr='photos'))
 
 
 class Post(models.Model):
@@ -87,12 +136,27 @@ class Post(models.Model):
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
     timestamp = models.DateTimeField(auto_now=True)
     caption = models.TextField(blank=False)
+    # counters kept up to date by like/unlike and Comment.save/delete (see
+    # reconcile_counters)
+    num_likes = models.PositiveIntegerField(default=0)
+    num_comments = models.PositiveIntegerField(default=0)
+
+    objects = PostQuerySet.as_manager()
 
     def __str__(self):
         '''return string representation of post'''
         
         return f'{self.caption}'
 
+    def save(self, *args, **kwargs):
+        '''save the post; timestamp is auto_now, so an edit moves the post up
+        the pull feed and its TimelineEntry rows have to move with it'''
+
+        editing = not self._state.adding
+        super().save(*args, **kwargs)
+        if editing:
+            TimelineEntry.objects.filter(post=self).update(timestamp=self.timestamp)
+
     def get_all_photos(self):
         '''return QuerySet of photos for this post'''
 
@@ -114,6 +178,27 @@ class Post(models.Model):
 
         return Like.objects.filter(post=self)
 
+    def like(self, profile):
+        '''record that profile likes this Post, updating num_likes in the
+        same transaction; does nothing if they already do. Returns True if
+        a Like was created.'''
+
+        with transaction.atomic():
+            like, created = Like.objects.get_or_create(profile=profile, post=self)
+            if created:
+                Post.objects.filter(pk=self.pk).update(num_likes=F('num_likes') + 1)
+        return created
+
+    def unlike(self, profile):
+        '''remove profile's like of this Post, updating num_likes in the
+        same transaction. Returns True if there was a Like to delete.'''
+
+        with transaction.atomic():
+            deleted, _ = Like.objects.filter(profile=profile, post=self).delete()
+            if deleted:
+                Post.objects.filter(pk=self.pk).update(num_likes=F('num_likes') - deleted)
+        return bool(deleted)
+
 class Photo(models.Model):
     '''Encapsulate idea of an immage associated with a post'''
 
@@ -144,11 +229,33 @@ class Follow(models.Model):
     follower_profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="follower_profile")
     timestamp = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['follower_profile', 'profile'], name='follow_unique')]
+
     def __str__(self):
         '''return string representation of follow relationship'''
 
         return f'{self.follower_profile} follows {self.profile}'
 
+class TimelineEntry(models.Model):
+    '''a Post pushed into the feed of one of its author's followers (see
+    timeline.py); only kept while settings.MINI_INSTA_FEED is "push"'''
+
+    # the Profile whose feed this is
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="timeline")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    # copied from the post, so a page of the feed is a range of one index
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['profile', 'post'], name='timeline_profile_post')]
+        indexes = [models.Index(fields=['profile', '-timestamp'], name='timeline_profile_time_idx')]
+
+    def __str__(self):
+        '''return string representation of timeline entry'''
+
+        return f"{self.post} in {self.profile}'s feed"
+
 class Comment(models.Model):
     '''encapsulates the idea of one Profile providing a response or commentary on a Post'''
 
@@ -163,6 +270,25 @@ class Comment(models.Model):
 
         return f"{self.profile}'s comment on {self.post.profile}'s post"
 
+    def save(self, *args, **kwargs):
+        '''save the comment; a new one adds one to its post's num_comments
+        in the same transaction'''
+
+        with transaction.atomic():
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+            if adding:
+                Post.objects.filter(pk=self.post_id).update(num_comments=F('num_comments') + 1)
+
+    def delete(self, *args, **kwargs):
+        '''delete the comment and take it off its post's num_comments in the
+        same transaction (bulk deletes are left to reconcile_counters)'''
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Post.objects.filter(pk=self.post_id).update(num_comments=F('num_comments') - 1)
+        return result
+
 class Like(models.Model):
     '''encapsulates the idea of one Profile providing approval of a Post'''
 
@@ -171,7 +297,34 @@ class Like(models.Model):
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
     timestamp = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['profile', 'post'], name='like_unique')]
+
     def __str__(self):
         '''return string representation of like'''
 
-        return f"{self.profile} likes {self.post.profile}'s post"
\ No newline at end of file
+        return f"{self.profile} likes {self.post.profile}'s post"
+
+# every counter column: (model, field, model of the rows it counts, their
+# foreign key to the counting model)
+COUNTERS = [
+    (Profile, 'num_followers', Follow, 'profile'),
+    (Profile, 'num_following', Follow, 'follower_profile'),
+    (Post, 'num_likes', Like, 'post'),
+    (Post, 'num_comments', Comment, 'post'),
+]
+
+
+def reconcile_counters(dry_run=False):
+    '''Find counter columns that disagree with the rows they count (e.g.
+    after rows were added or deleted in the admin) and, unless dry_run, set
+    them to the true count. Returns {'Model.field': number of rows off}.'''
+
+    drift = {}
+    for model, field, counted, key in COUNTERS:
+        actual = Coalesce(models.Subquery(
+            counted.objects.filter(**{key: models.OuterRef('pk')}).order_by()
+                           .values(key).annotate(n=models.Count('pk')).values('n')), 0)
+        stale = model.objects.alias(actual=actual).exclude(**{field: F('actual')})
+        drift[f'{model.__name__}.{field}'] = stale.count() if dry_run else stale.update(**{field: actual})
+    return drift
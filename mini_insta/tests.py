@@ -1,3 +1,367 @@
-from django.test import TestCase
+# File: mini_insta/tests.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: tests for mini_insta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import *
+from . import timeline
+
+# queries to render a feed page: session, user, profile, page count, posts,
+# photos, comments
+FEED_QUERIES = 7
+
+
+class QueryBudgetMixin:
+    '''TestCase mixin for pages that must not grow an N+1 query'''
+
+    def get_within_budget(self, url, budget):
+        '''GET url and fail if rendering it took more than budget queries,
+        listing the queries; returns the response'''
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        if len(queries) > budget:
+            sql = '\n'.join(query['sql'] for query in queries.captured_queries)
+            self.fail(f'{url} took {len(queries)} queries, budget is {budget}:\n{sql}')
+        return response
+
+
+def make_profile(name):
+    '''create a User and their Profile'''
+
+    user = User.objects.create(username=name)
+    return Profile.objects.create(user=user, username=name, display_name=name.title())
+
+
+def make_post(profile, caption, likers=(), commenters=()):
+    '''create a Post by profile with one photo, and likes and comments from other profiles'''
+
+    post = Post.objects.create(profile=profile, caption=caption)
+    Photo.objects.create(post=post, image_url=f'https://example.com/{caption}.jpg')
+    for liker in likers:
+        post.like(liker)
+    for commenter in commenters:
+        Comment.objects.create(post=post, profile=commenter, text=f'nice {caption}')
+    return post
+
+
+class PostFeedTests(TestCase):
+    '''the feed is built with the same number of queries however large it is'''
+
+    def setUp(self):
+        self.reader = make_profile('reader')
+        self.client.force_login(self.reader.user)
+
+    def follow_new_profiles(self, n):
+        '''make n more profiles the reader follows, each with two posts'''
+
+        for i in range(n):
+            author = make_profile(f'author{Profile.objects.count()}')
+            self.reader.follow(author)
+            make_post(author, f'{author.username}-a', likers=[self.reader], commenters=[self.reader])
+            make_post(author, f'{author.username}-b')
+
+    def feed_queries(self):
+        '''render the feed, returning the response and the number of queries it took'''
+
+        with self.assertNumQueries(FEED_QUERIES):
+            return self.client.get(reverse('mini_insta:show_feed'))
+
+    def test_feed_contents(self):
+        '''the feed holds only followed profiles' posts, newest first'''
+
+        self.follow_new_profiles(2)
+        stranger = make_profile('stranger')
+        make_post(stranger, 'unfollowed-post')
+
+        response = self.feed_queries()
+        posts = list(response.context['posts'])
+        self.assertEqual(len(posts), 4)
+        self.assertNotContains(response, 'unfollowed-post')
+        self.assertEqual(posts, sorted(posts, key=lambda p: (p.timestamp, p.pk), reverse=True))
+        liked = [p for p in posts if p.num_likes]
+        self.assertEqual(len(liked), 2)
+        self.assertEqual(liked[0].first_liker, 'reader')
+        self.assertEqual(len(liked[0].comments), 1)
+
+    def test_feed_query_count_is_constant(self):
+        '''following 3 or 30 profiles costs the same number of queries'''
+
+        self.follow_new_profiles(3)
+        self.feed_queries()
+        self.follow_new_profiles(27)
+        response = self.feed_queries()
+        self.assertEqual(len(response.context['posts']), 20)
+        self.assertTrue(response.context['is_paginated'])
+
+
+@override_settings(MINI_INSTA_FEED='push', MINI_INSTA_FANOUT_LIMIT=2, MINI_INSTA_TIMELINE_LENGTH=3)
+class TimelineTests(TestCase):
+    '''with MINI_INSTA_FEED = "push", the feed is read from TimelineEntry'''
+
+    def setUp(self):
+        self.reader = make_profile('reader')
+        self.author = make_profile('author')
+        self.client.force_login(self.reader.user)
+
+    def follow(self, profile):
+        '''follow profile through the view'''
+
+        self.client.get(reverse('mini_insta:follow', kwargs={'pk': profile.pk}))
+
+    def post(self, profile, caption):
+        '''make a post and fan it out, as CreatePostView does'''
+
+        post = make_post(profile, caption)
+        timeline.fan_out(post)
+        return post
+
+    def feed(self):
+        '''the posts in the reader's feed page'''
+
+        response = self.client.get(reverse('mini_insta:show_feed'))
+        return list(response.context['posts'])
+
+    def test_push_feed_matches_pull_feed(self):
+        '''posts made before and after following show up newest first'''
+
+        self.post(self.author, 'before')
+        self.follow(self.author)
+        self.post(self.author, 'after')
+        self.assertEqual(self.feed(), list(self.reader.get_post_feed()))
+        self.assertEqual([p.caption for p in self.feed()], ['after', 'before'])
+
+    def test_unfollow_removes_posts(self):
+        '''unfollowing takes the author's posts out of the pushed feed'''
+
+        self.follow(self.author)
+        self.post(self.author, 'gone')
+        self.client.get(reverse('mini_insta:delete_follow', kwargs={'pk': self.author.pk}))
+        self.assertEqual(self.feed(), [])
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_timeline_is_capped(self):
+        '''only the newest MINI_INSTA_TIMELINE_LENGTH posts are kept in a feed'''
+
+        self.follow(self.author)
+        for i in range(5):
+            self.post(self.author, f'post{i}')
+        self.assertEqual(TimelineEntry.objects.filter(profile=self.reader).count(), 3)
+        self.assertEqual([p.caption for p in self.feed()], ['post4', 'post3', 'post2'])
+
+    def test_author_crossing_the_limit(self):
+        '''posts made while the author was pulled stay in the feed after the
+        author drops back to MINI_INSTA_FANOUT_LIMIT followers and is pushed again'''
+
+        self.follow(self.author)
+        fan1, fan2 = make_profile('fan1'), make_profile('fan2')
+        fan1.follow(self.author)
+        fan2.follow(self.author)
+        self.post(self.author, 'while-pulled')
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual([p.caption for p in self.feed()], ['while-pulled'])
+
+        # down to the limit: the post is pushed to the remaining followers
+        fan2.unfollow(self.author)
+        timeline.remove(fan2, self.author)
+        self.assertEqual(set(TimelineEntry.objects.values_list('profile', flat=True)), {self.reader.pk, fan1.pk})
+        self.post(self.author, 'pushed')
+        self.assertEqual([p.caption for p in self.feed()], ['pushed', 'while-pulled'])
+
+        # over the limit again: both kinds of post show up once
+        make_profile('fan3').follow(self.author)
+        self.post(self.author, 'pulled-again')
+        self.assertEqual([p.caption for p in self.feed()], ['pulled-again', 'pushed', 'while-pulled'])
+        self.assertEqual(self.feed(), list(self.reader.get_post_feed()))
+
+    def test_edited_post_moves_in_both_feeds(self):
+        '''editing a post moves it to the top of the push feed, as in the pull feed'''
+
+        self.follow(self.author)
+        older = self.post(self.author, 'older')
+        self.post(self.author, 'newer')
+        older.caption = 'older, edited'
+        older.save()
+        self.assertEqual([p.caption for p in self.feed()], ['older, edited', 'newer'])
+        self.assertEqual(self.feed(), list(self.reader.get_post_feed()))
+
+    def test_popular_profile_is_pulled(self):
+        '''posts of a profile with more than MINI_INSTA_FANOUT_LIMIT followers
+        are not pushed, but still appear in the feed'''
+
+        for name in ['fan1', 'fan2']:
+            make_profile(name).follow(self.author)
+        self.follow(self.author)
+        self.post(self.author, 'popular')
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual([p.caption for p in self.feed()], ['popular'])
+
+
+class ReaderAuthorTestCase(TestCase):
+    '''fixture: a logged-in reader, and an author with one post'''
+
+    def setUp(self):
+        self.reader = make_profile('reader')
+        self.author = make_profile('author')
+        self.post = make_post(self.author, 'first-post')
+        self.client.force_login(self.reader.user)
+
+
+class CounterTests(ReaderAuthorTestCase):
+    '''the counter columns follow the follow/like views'''
+
+    def assertCounts(self, followers, likes):
+        '''check the author's followers, the reader's following and the
+        post's likes, as saved in the database'''
+
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.post.refresh_from_db()
+        self.assertEqual(self.author.num_followers, followers)
+        self.assertEqual(self.reader.num_following, followers)
+        self.assertEqual(self.post.num_likes, likes)
+
+    def test_views_update_counters(self):
+        '''following and liking add one, unfollowing and unliking take it away'''
+
+        self.client.get(reverse('mini_insta:follow', kwargs={'pk': self.author.pk}))
+        self.client.post(reverse('mini_insta:like', kwargs={'pk': self.post.pk}))
+        self.assertCounts(1, 1)
+        self.client.get(reverse('mini_insta:delete_follow', kwargs={'pk': self.author.pk}))
+        self.client.post(reverse('mini_insta:delete_like', kwargs={'pk': self.post.pk}))
+        self.assertCounts(0, 0)
+
+    def test_profile_page_counts_without_queries(self):
+        '''the follower counts come from the profile row itself'''
+
+        self.reader.follow(self.author)
+        self.author.refresh_from_db()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.author.get_num_followers(), 1)
+
+    def test_comments_update_counter(self):
+        '''creating a comment adds one to num_comments, deleting it takes it away'''
+
+        comment = Comment.objects.create(post=self.post, profile=self.reader, text='hi')
+        Comment.objects.create(post=self.post, profile=self.author, text='thanks')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.num_comments, 2)
+        comment.text = 'hi again'
+        comment.save()
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.num_comments, 1)
+        self.assertEqual(reconcile_counters(dry_run=True)['Post.num_comments'], 0)
+
+    def test_reconcile_counters(self):
+        '''rows added behind the counters' back are found and fixed'''
+
+        Follow.objects.create(follower_profile=self.reader, profile=self.author)
+        # bulk_create skips Comment.save
+        Comment.objects.bulk_create([Comment(post=self.post, profile=self.reader, text='hi')])
+        drift = reconcile_counters(dry_run=True)
+        self.assertEqual(drift, {'Profile.num_followers': 1, 'Profile.num_following': 1,
+                                 'Post.num_likes': 0, 'Post.num_comments': 1})
+        reconcile_counters()
+        self.assertEqual(set(reconcile_counters(dry_run=True).values()), {0})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.num_comments, 1)
+        self.assertCounts(1, 0)
+
+
+class IdempotentActionTests(ReaderAuthorTestCase):
+    '''repeating a follow or like changes nothing, and the JSON endpoints
+    report the new counts'''
+
+    def test_double_follow_and_like(self):
+        '''a double click makes one Follow and one Like, counted once'''
+
+        for _ in range(2):
+            self.client.post(reverse('mini_insta:follow', kwargs={'pk': self.author.pk}))
+            self.client.post(reverse('mini_insta:like', kwargs={'pk': self.post.pk}))
+        self.assertEqual(Follow.objects.count(), 1)
+        self.assertEqual(Like.objects.count(), 1)
+        self.author.refresh_from_db()
+        self.post.refresh_from_db()
+        self.assertEqual((self.author.num_followers, self.post.num_likes), (1, 1))
+
+    def test_json_endpoints(self):
+        '''each JSON endpoint answers with the new state and count'''
+
+        response = self.client.post(reverse('mini_insta:follow_json', kwargs={'pk': self.author.pk}))
+        self.assertEqual(response.json(), {'following': True, 'num_followers': 1})
+        response = self.client.post(reverse('mini_insta:like_json', kwargs={'pk': self.post.pk}))
+        self.assertEqual(response.json(), {'liked': True, 'num_likes': 1})
+        response = self.client.post(reverse('mini_insta:like_json', kwargs={'pk': self.post.pk}))
+        self.assertEqual(response.json(), {'liked': True, 'num_likes': 1})
+        response = self.client.post(reverse('mini_insta:delete_like_json', kwargs={'pk': self.post.pk}))
+        self.assertEqual(response.json(), {'liked': False, 'num_likes': 0})
+        response = self.client.post(reverse('mini_insta:delete_follow_json', kwargs={'pk': self.author.pk}))
+        self.assertEqual(response.json(), {'following': False, 'num_followers': 0})
+
+    def test_json_endpoints_refuse_get_and_anonymous_callers(self):
+        '''a GET changes nothing, and a caller who is not logged in gets JSON, not a login page'''
+
+        url = reverse('mini_insta:follow_json', kwargs={'pk': self.author.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(Follow.objects.exists())
+
+        self.client.logout()
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'error': 'login required'})
+        self.assertFalse(Follow.objects.exists())
+
+
+class PageQueryTests(QueryBudgetMixin, ReaderAuthorTestCase):
+    '''profile, post and follower pages take a fixed number of queries'''
+
+    def grow(self, n):
+        '''add n posts by the author and n followers of the author, each
+        following and liking and commenting on everything'''
+
+        for i in range(n):
+            fan = make_profile(f'fan{Profile.objects.count()}')
+            fan.follow(self.author)
+            self.author.follow(fan)
+            make_post(self.author, f'post{Post.objects.count()}', likers=[fan], commenters=[fan])
+
+    def check_pages(self):
+        '''render each page once, within its query budget'''
+
+        post = Post.objects.filter(profile=self.author).latest('pk')
+        pages = [
+            (reverse('mini_insta:show_profile', kwargs={'pk': self.author.pk}), 7),
+            (reverse('mini_insta:post', kwargs={'pk': post.pk}), 7),
+            (reverse('mini_insta:show_followers', kwargs={'pk': self.author.pk}), 4),
+            (reverse('mini_insta:show_following', kwargs={'pk': self.author.pk}), 4),
+            (reverse('mini_insta:search') + '?query=post', 6),
+        ]
+        for url, budget in pages:
+            self.get_within_budget(url, budget)
+
+    def test_pages_within_budget(self):
+        '''the budgets hold with 1 and with 11 extra posts and followers'''
+
+        self.grow(1)
+        self.check_pages()
+        self.grow(10)
+        self.check_pages()
+
+    def test_profile_page_contents(self):
+        '''the prefetched posts and followers are the profile's own'''
+
+        self.grow(3)
+        response = self.client.get(reverse('mini_insta:show_profile', kwargs={'pk': self.author.pk}))
+        self.assertEqual(len(response.context['profile'].posts), 4)
+        self.assertContains(response, 'Posts: 4')
+        self.assertContains(response, 'value="Follow"')
+        response = self.client.get(reverse('mini_insta:show_followers', kwargs={'pk': self.author.pk}))
+        self.assertEqual(len(response.context['followers']), 3)
@@ -0,0 +1,115 @@
+# File: mini_insta/timeline.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: fan-out-on-write feeds: each new post is copied into a capped
+# timeline per follower, so reading a feed does not merge every followed profile
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .models import Follow, Post, Profile, TimelineEntry
+
+
+def timelines_enabled():
+    '''True if feeds are pushed into TimelineEntry rather than pulled'''
+
+    return getattr(settings, 'MINI_INSTA_FEED', 'pull') == 'push'
+
+
+def is_pulled(profile):
+    '''True if profile has too many followers to push its posts to each of
+    them; its posts are merged into feeds at read time instead'''
+
+    return Profile.objects.filter(pk=profile.pk, num_followers__gt=settings.MINI_INSTA_FANOUT_LIMIT).exists()
+
+
+def trim(profiles=None):
+    '''delete the oldest entries of the timelines (of profiles, or all)
+    holding more than MINI_INSTA_TIMELINE_LENGTH posts'''
+
+    length = settings.MINI_INSTA_TIMELINE_LENGTH
+    owners = TimelineEntry.objects.values('profile')
+    if profiles is not None:
+        owners = owners.filter(profile__in=profiles)
+    # only the timelines over the cap cost more than this one query
+    for owner in owners.annotate(n=Count('pk')).filter(n__gt=length).values_list('profile', flat=True):
+        entries = TimelineEntry.objects.filter(profile=owner).order_by('-timestamp', '-post')
+        oldest_kept = entries.values_list('timestamp', flat=True)[length - 1]
+        entries.filter(timestamp__lt=oldest_kept).delete()
+
+
+def fan_out(post):
+    '''push a new post into the timeline of each of its author's followers'''
+
+    if not timelines_enabled() or is_pulled(post.profile):
+        return
+    push(Post.objects.filter(pk=post.pk), followers_of(post.profile))
+
+
+def backfill(follower, profile):
+    '''follower has just followed profile: add profile's recent posts to their timeline'''
+
+    if not timelines_enabled() or is_pulled(profile):
+        return
+    push(recent_posts(profile), [follower.pk])
+
+
+def remove(follower, profile):
+    '''follower has just unfollowed profile: take profile's posts out of their
+    timeline. If that took profile down to MINI_INSTA_FANOUT_LIMIT followers,
+    its posts are no longer pulled into feeds, so the posts it made while it
+    was pulled are pushed to its remaining followers now.'''
+
+    if not timelines_enabled():
+        return
+    TimelineEntry.objects.filter(profile=follower, post__profile=profile).delete()
+    if Profile.objects.filter(pk=profile.pk, num_followers=settings.MINI_INSTA_FANOUT_LIMIT).exists():
+        push(recent_posts(profile), followers_of(profile))
+
+
+def followers_of(profile):
+    '''the pks of the profiles following profile'''
+
+    return list(Follow.objects.filter(profile=profile).values_list('follower_profile', flat=True))
+
+
+def recent_posts(profile):
+    '''the posts by profile that fit in a timeline'''
+
+    return Post.objects.filter(profile=profile).order_by('-timestamp')[:settings.MINI_INSTA_TIMELINE_LENGTH]
+
+
+def push(posts, followers):
+    '''add posts to the timelines of followers (profile pks), skipping any
+    already there, then trim those timelines'''
+
+    posts = list(posts.values_list('pk', 'timestamp'))
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(profile_id=follower, post_id=pk, timestamp=timestamp)
+         for follower in followers for pk, timestamp in posts],
+        ignore_conflicts=True, batch_size=5000)
+    trim(followers)
+
+
+def timeline_posts(profile):
+    '''return a QuerySet of the posts in profile's feed, newest first: their
+    timeline, plus the posts of any followed profiles that are pulled'''
+
+    pulled = list(Profile.objects.filter(profile__follower_profile=profile,
+                                         num_followers__gt=settings.MINI_INSTA_FANOUT_LIMIT)
+                                 .values_list('pk', flat=True))
+
+    if pulled:
+        posts = Post.objects.filter(Q(timelineentry__profile=profile) | Q(profile__in=pulled)).distinct()
+        return posts.with_feed_details().order_by('-timestamp', '-pk')
+    # a page is then a range of timeline_profile_time_idx
+    posts = Post.objects.filter(timelineentry__profile=profile)
+    return posts.with_feed_details().order_by('-timelineentry__timestamp', '-pk')
+
+
+def rebuild_timelines():
+    '''rebuild every timeline from the Follow table, e.g. after switching
+    MINI_INSTA_FEED to "push"'''
+
+    TimelineEntry.objects.all().delete()
+    for follow in Follow.objects.select_related('follower_profile', 'profile'):
+        backfill(follow.follower_profile, follow.profile)
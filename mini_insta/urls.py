@@ -29,4 +29,9 @@ urlpatterns = [
     path('profile/<int:pk>/delete_follow', UnFollowProfileView.as_view(), name='delete_follow'),
     path('post/<int:pk>/like', LikePostView.as_view(), name='like'),
     path('post/<int:pk>/delete_like', UnLikePostView.as_view(), name='delete_like'),
+    # the same actions, answering with the new counts as JSON
+    path('api/profile/<int:pk>/follow', FollowProfileView.as_view(as_json=True), name='follow_json'),
+    path('api/profile/<int:pk>/delete_follow', UnFollowProfileView.as_view(as_json=True), name='delete_follow_json'),
+    path('api/post/<int:pk>/like', LikePostView.as_view(as_json=True), name='like_json'),
+    path('api/post/<int:pk>/delete_like', UnLikePostView.as_view(as_json=True), name='delete_like_json'),
 ]
\ No newline at end of file
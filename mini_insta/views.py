@@ -2,11 +2,13 @@
 # Author: Zacharie Verdieu (zverdieu@bu.edu), 9/25/2025
 # Description: views for mini_insta application
 from django.shortcuts import render, redirect
-from django.db.models import Q
+from django.http import JsonResponse
+from django.db.models import Prefetch, Q
 from django.urls import reverse
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, View
 from .models import *
 from .forms import CreatePostForm, UpdateProfileForm, UpdatePostForm, CreateProfileForm
+from . import timeline
 from django.contrib.auth.mixins import LoginRequiredMixin ##for authorization
 from django.contrib.auth.forms import UserCreationForm ## for new User
 from django.contrib.auth.models import User ## django user model
@@ -30,15 +32,20 @@ class ProfileDetailView(DetailView):
     context_object_name = "profile"
 
     def get_object(self):
-        '''method to find Profile object for this model instance'''
+        '''method to find Profile object for this model instance, with its
+        posts and their photos prefetched into profile.posts / post.photos'''
+
+        posts = Post.objects.order_by('pk').with_photos()
+        profiles = Profile.objects.select_related('user').prefetch_related(
+            Prefetch('post_set', queryset=posts, to_attr='posts'))
 
         # if no pk in kwargs, return logged-in user instead
         if 'pk' in self.kwargs:
             pk = self.kwargs['pk']
-            profile = Profile.objects.get(pk=pk)
+            profile = profiles.get(pk=pk)
         else:
             user = self.request.user
-            profile = Profile.objects.get(user=user)
+            profile = profiles.get(user=user)
         return profile
 
     def get_context_data(self, **kwargs):
@@ -46,7 +53,9 @@ class ProfileDetailView(DetailView):
         
         context = super().get_context_data(**kwargs)
         # current_profile is the Profile of the logged-in user
-        context['current_profile'] = Profile.objects.get(user=self.request.user)
+        current_profile = Profile.objects.get(user=self.request.user)
+        context['current_profile'] = current_profile
+        context['is_following'] = Follow.objects.filter(follower_profile=current_profile, profile=self.object).exists()
         return context
 
 class UpdateProfileView(LoginRequiredMixin, UpdateView):
@@ -108,15 +117,19 @@ class PostDetailView(DetailView):
     template_name = "mini_insta/post.html"
     context_object_name = "post"
 
+    def get_queryset(self):
+        '''load the author, photos, comments and first liker with the post'''
+
+        return Post.objects.with_feed_details().select_related('profile__user')
+
     def get_context_data(self, **kwargs):
         '''supplies context variables for this view'''
 
         context = super().get_context_data(**kwargs)
 
         current_profile = Profile.objects.get(user=self.request.user)
-        post = Post.objects.get(pk = self.kwargs['pk'])
         # checks if there exists a like object for this post where profile = current profile
-        has_liked = post.get_likes().filter(profile=current_profile).exists()
+        has_liked = self.object.get_likes().filter(profile=current_profile).exists()
         context['has_liked'] = has_liked
         return context
         
@@ -172,6 +185,8 @@ class CreatePostView(LoginRequiredMixin, CreateView):
             photo = Photo(post=post, image_file=file)
             photo.save()
 
+        # push the post into followers' feeds
+        timeline.fan_out(post)
 
         return super().form_valid(form)
 
@@ -238,6 +253,13 @@ class ShowFollowersDetialView(DetailView):
     template_name = "mini_insta/show_followers.html"
     context_object_name = "profile"
 
+    def get_context_data(self, **kwargs):
+        '''provide the followers as one query'''
+
+        context = super().get_context_data(**kwargs)
+        context['followers'] = self.object.get_followers()
+        return context
+
 class ShowFollowingDetialView(DetailView):
     '''View to show profiles followed by a profile, provide profile context variable'''
 
@@ -245,12 +267,29 @@ class ShowFollowingDetialView(DetailView):
     template_name = "mini_insta/show_following.html"
     context_object_name = "profile"
 
+    def get_context_data(self, **kwargs):
+        '''provide the followed profiles as one query'''
+
+        context = super().get_context_data(**kwargs)
+        context['following'] = self.object.get_following()
+        return context
+
 class PostFeedListView(LoginRequiredMixin, ListView):
     '''Displays all posts in the feed of a Profile object'''
 
     model = Post
     template_name = "mini_insta/show_feed.html"
-    context_object_name = "post"
+    context_object_name = "posts"
+    paginate_by = 20
+
+    def get_queryset(self):
+        '''posts from the profiles this profile follows, newest first'''
+
+        # use get_object instead of using pk
+        self.profile = self.get_object()
+        if timeline.timelines_enabled():
+            return timeline.timeline_posts(self.profile)
+        return self.profile.get_post_feed()
 
     def get_context_data(self):
         '''Return a dictionary containing context variables for use in this template'''
@@ -258,10 +297,7 @@ class PostFeedListView(LoginRequiredMixin, ListView):
         # superclass method
         context = super().get_context_data()
 
-        # use get_object instead of using pk
-        profile = self.get_object()
-
-        context['profile'] = profile
+        context['profile'] = self.profile
         return context
 
     def get_object(self):
@@ -288,6 +324,7 @@ class SearchView(LoginRequiredMixin, ListView):
 
         # use get_object instead of pk
         profile = self.get_object()
+        self.profile = profile
 
         if 'query' not in request.GET:
             return render(request, 'mini_insta/search.html', {'profile': profile})
@@ -298,7 +335,7 @@ class SearchView(LoginRequiredMixin, ListView):
         '''returns QuerySet of instance data for this search'''
 
         query = self.request.GET.get('query', '')
-        return Post.objects.filter(caption__contains=query)
+        return Post.objects.filter(caption__contains=query).with_photos()
 
     def get_context_data(self):
         '''Return a dictionary containing context variables for use in this template'''
@@ -307,8 +344,8 @@ class SearchView(LoginRequiredMixin, ListView):
         context = super().get_context_data()
 
 
-        # use get_object instead of pk
-        profile = self.get_object()
+        # the Profile found by dispatch
+        profile = self.profile
         query = self.request.GET.get('query', '')
 
         context['profile'] = profile
@@ -340,60 +377,108 @@ class LogoutConfirmationView(TemplateView):
 
     template_name = "mini_insta/logged_out.html"
 
-class FollowProfileView(LoginRequiredMixin, TemplateView):
-    '''view for following a profile'''
+class ProfileActionView(LoginRequiredMixin, View):
+    '''base for the follow and like views: the action runs in post(). The
+    HTML variants also accept GET, as they always have. With as_json=True,
+    only POST is accepted, and callers who are not logged in get a JSON 401
+    instead of a redirect to the login page.'''
+
+    as_json = False
 
     def dispatch(self, request, *args, **kwargs):
+        '''answer JSON callers' errors in JSON before running the action'''
+
+        if self.as_json:
+            if not request.user.is_authenticated:
+                return JsonResponse({'error': 'login required'}, status=401)
+            if request.method != 'POST':
+                response = JsonResponse({'error': 'use POST'}, status=405)
+                response['Allow'] = 'POST'
+                return response
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        '''the HTML variants take the action on GET as well'''
+
+        return self.post(request, *args, **kwargs)
+
+    def get_login_url(self):
+        '''return URL for login page when trying to follow or like but not logged in'''
+
+        return reverse('mini_insta:login')
+
+class FollowProfileView(ProfileActionView):
+    '''view for following a profile; following twice is the same as once.
+    With as_json=True, returns the new follower count instead of redirecting.'''
+
+    def post(self, request, *args, **kwargs):
         '''handles request for following a profile'''
 
         target_profile = Profile.objects.get(pk=kwargs['pk'])
         current_profile = Profile.objects.get(user=self.request.user)
 
         if current_profile != target_profile:
-            follow = Follow(follower_profile=current_profile, profile=target_profile)
-            follow.save()
-        url = reverse('mini_insta:show_profile', kwargs={'pk': target_profile.pk})
-        return redirect(url)
+            if current_profile.follow(target_profile):
+                timeline.backfill(current_profile, target_profile)
+        return follow_response(self.as_json, current_profile, target_profile)
 
-class UnFollowProfileView(LoginRequiredMixin, TemplateView):
-    ''' view for unfollowing a profile'''
+class UnFollowProfileView(ProfileActionView):
+    ''' view for unfollowing a profile; with as_json=True, returns the new
+    follower count instead of redirecting'''
 
-    def dispatch(self, request, *args, **kwargs):
+    def post(self, request, *args, **kwargs):
         '''deletes actual instance of the follow'''
 
         target_profile = Profile.objects.get(pk=kwargs['pk'])
         current_profile = Profile.objects.get(user=self.request.user)
 
-        follow = Follow.objects.filter(follower_profile=current_profile, profile=target_profile)
-        follow.delete()
-        url = reverse('mini_insta:show_profile', kwargs={'pk': target_profile.pk})
-        return redirect(url)
+        if current_profile.unfollow(target_profile):
+            timeline.remove(current_profile, target_profile)
+        return follow_response(self.as_json, current_profile, target_profile)
 
-class LikePostView(LoginRequiredMixin, TemplateView):
-    '''view for liking a post'''
+def follow_response(as_json, current_profile, target_profile):
+    '''redirect back to the target profile, or report the follow as JSON'''
 
-    def dispatch(self, request, *args, **kwargs):
+    if as_json:
+        target_profile.refresh_from_db(fields=['num_followers'])
+        following = Follow.objects.filter(follower_profile=current_profile, profile=target_profile).exists()
+        return JsonResponse({'following': following, 'num_followers': target_profile.num_followers})
+    url = reverse('mini_insta:show_profile', kwargs={'pk': target_profile.pk})
+    return redirect(url)
+
+class LikePostView(ProfileActionView):
+    '''view for liking a post; liking twice is the same as once. With
+    as_json=True, returns the new like count instead of redirecting.'''
+
+    def post(self, request, *args, **kwargs):
         '''handles request for liking a post'''
 
         post = Post.objects.get(pk=kwargs['pk'])
         current_profile = Profile.objects.get(user=self.request.user)
 
         if post.profile != current_profile:
-            this_like = Like(profile=current_profile, post=post)
-            this_like.save()
-        url = reverse('mini_insta:post', kwargs={'pk': post.pk})
-        return redirect(url)
+            post.like(current_profile)
+        return like_response(self.as_json, current_profile, post)
 
-class UnLikePostView(LoginRequiredMixin, TemplateView):
-    '''view for unliking a post'''
+class UnLikePostView(ProfileActionView):
+    '''view for unliking a post; with as_json=True, returns the new like
+    count instead of redirecting'''
 
-    def dispatch(self, request, *args, **kwargs):
+    def post(self, request, *args, **kwargs):
         '''deletes actual instance of this like'''
 
         post = Post.objects.get(pk=kwargs['pk'])
         current_profile = Profile.objects.get(user=self.request.user)
 
-        this_like = Like.objects.filter(profile=current_profile, post=post)
-        this_like.delete()
-        url = reverse('mini_insta:post', kwargs={'pk': post.pk})
-        return redirect(url)
\ No newline at end of file
+        post.unlike(current_profile)
+        return like_response(self.as_json, current_profile, post)
+
+def like_response(as_json, current_profile, post):
+    '''redirect back to the post, or report the like as JSON'''
+
+    if as_json:
+        post.refresh_from_db(fields=['num_likes'])
+        liked = Like.objects.filter(profile=current_profile, post=post).exists()
+        return JsonResponse({'liked': liked, 'num_likes': post.num_likes})
+    url = reverse('mini_insta:post', kwargs={'pk': post.pk})
+    return redirect(url)
\ No newline at end of file
@@ -0,0 +1,121 @@
+# File: voter_analytics/columnar.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: optional in-memory column store answering the voter search
+# filters and graph aggregates with NumPy instead of ORM queries
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional; the ORM path is used without it
+    np = None
+
+from django.conf import settings
+
+from cs412.charts import dataset_version
+from .filters import ELECTIONS, election_bit, parse_filters, participation_values
+from .models import Voter
+
+
+def columnar_enabled():
+    '''True if settings.VOTER_ANALYTICS_ENGINE asks for the column store and
+    numpy is installed'''
+
+    return np is not None and getattr(settings, 'VOTER_ANALYTICS_ENGINE', 'orm') == 'columnar'
+
+
+class VoterColumns:
+    '''
+    The whole Voter table held as NumPy arrays, one per filter dimension:
+    pk, birth year, voter score, party code (as an index into self.parties)
+    and the participation bitmask. Filters become boolean masks and the
+    graph aggregates become bincounts over the matching rows.
+    '''
+
+    def __init__(self, version=None):
+        self.version = version
+        rows = Voter.objects.values_list('pk', 'date_of_birth', 'voter_score', 'party_code', 'participation')
+        pks, years, scores, parties, participation = [], [], [], [], []
+        for pk, date_of_birth, voter_score, party_code, voted in rows.iterator(chunk_size=10000):
+            pks.append(pk)
+            years.append(date_of_birth.year)
+            scores.append(voter_score)
+            parties.append(party_code)
+            participation.append(voted)
+
+        self.pk = np.array(pks, dtype=np.int64)
+        self.birth_year = np.array(years, dtype=np.int16)
+        self.voter_score = np.array(scores, dtype=np.int16)
+        self.participation = np.array(participation, dtype=np.uint8)
+        # party codes are few, so store a small integer per voter
+        self.parties, codes = np.unique(np.array(parties, dtype=object), return_inverse=True)
+        self.party = codes.astype(np.int16)
+
+    def __len__(self):
+        return len(self.pk)
+
+    def mask(self, params):
+        '''return a boolean array selecting the voters that match the search
+        form parameters in params, like filter_voters does'''
+
+        filters = parse_filters(params)
+        selected = np.ones(len(self), dtype=bool)
+
+        if filters['party']:
+            found = np.flatnonzero(self.parties == filters['party'])
+            if not len(found):
+                return np.zeros(len(self), dtype=bool)
+            selected &= self.party == found[0]
+        if filters['min_year'] is not None:
+            selected &= self.birth_year >= filters['min_year']
+        if filters['max_year'] is not None:
+            selected &= self.birth_year <= filters['max_year']
+        if filters['voter_score'] is not None:
+            selected &= self.voter_score == filters['voter_score']
+        if filters['mask']:
+            values = participation_values(filters['mask'], filters['match_any'])
+            selected &= np.isin(self.participation, values)
+        return selected
+
+    def count(self, params):
+        '''number of voters matching params'''
+
+        return int(np.count_nonzero(self.mask(params)))
+
+    def aggregates(self, params):
+        '''the same numbers as voter_aggregates() for the voters matching params'''
+
+        selected = self.mask(params)
+
+        years = self.birth_year[selected]
+        birth_years = {}
+        if len(years):
+            low = int(years.min())
+            counts = np.bincount(years - low)
+            birth_years = {low + i: int(n) for i, n in enumerate(counts) if n}
+
+        party_counts = np.bincount(self.party[selected], minlength=len(self.parties))
+        parties = {str(code): int(n) for code, n in zip(self.parties, party_counts) if n}
+
+        voted = self.participation[selected]
+        elections = {e: int(np.count_nonzero(voted & election_bit(e))) for e in ELECTIONS}
+
+        return {
+            'total': int(selected.sum()),
+            'birth_years': birth_years,
+            'parties': parties,
+            'elections': elections,
+        }
+
+
+# one column store per process, replaced when the voter data version changes
+_columns = None
+
+
+def voter_columns():
+    '''return this process's VoterColumns, reloading it from the database if
+    the voter data has been reloaded since it was built'''
+
+    global _columns
+    version = dataset_version('voters')['version']
+    if _columns is None or _columns.version != version:
+        _columns = VoterColumns(version)
+    return _columns
@@ -0,0 +1,118 @@
+# File: voter_analytics/export.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: streamed CSV / Parquet export of filtered voter lists
+
+import csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # pyarrow is optional; only CSV can be exported without it
+    pa = None
+
+from .filters import ELECTIONS, election_bit
+
+# rows fetched per round trip from the server-side cursor
+CHUNK_SIZE = 2000
+
+# exported columns, in the same order as the voter file
+COLUMNS = [
+    'voter_id', 'last_name', 'first_name',
+    'street_number', 'street_name', 'apartment_number', 'zip_code',
+    'date_of_birth', 'date_of_registration', 'party_affiliation', 'precinct_number',
+] + ELECTIONS + ['voter_score']
+
+QUERY_FIELDS = COLUMNS[:11] + ['participation', 'voter_score']
+
+
+def export_rows(voters):
+    '''yield one tuple per voter in COLUMNS order, streaming from the
+    database in chunks so memory stays flat however many voters match'''
+
+    rows = voters.order_by('pk').values_list(*QUERY_FIELDS).iterator(chunk_size=CHUNK_SIZE)
+    for row in rows:
+        *fields, participation, voter_score = row
+        yield (*fields, *(bool(participation & election_bit(e)) for e in ELECTIONS), voter_score)
+
+
+class Echo:
+    '''file-like object whose write() returns what was written, so
+    csv.writer can produce lines for a StreamingHttpResponse'''
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(voters):
+    '''yield the voters as CSV lines, header first'''
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for row in export_rows(voters):
+        yield writer.writerow(['TRUE' if value is True else 'FALSE' if value is False else value
+                               for value in row])
+
+
+class StreamBuffer:
+    '''write-only file for pyarrow that hands back whatever was written
+    since the last drain(), while tell() keeps counting every byte (the
+    Parquet writer records file offsets in the footer)'''
+
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def parquet_schema():
+    '''Arrow schema matching COLUMNS'''
+
+    return pa.schema(
+        [('voter_id', pa.string()), ('last_name', pa.string()), ('first_name', pa.string()),
+         ('street_number', pa.int32()), ('street_name', pa.string()),
+         ('apartment_number', pa.int32()), ('zip_code', pa.string()),
+         ('date_of_birth', pa.date32()), ('date_of_registration', pa.date32()),
+         ('party_affiliation', pa.string()), ('precinct_number', pa.int32())]
+        + [(election, pa.bool_()) for election in ELECTIONS]
+        + [('voter_score', pa.int8())]
+    )
+
+
+def parquet_stream(voters, row_group_size=50000):
+    '''yield the voters as a Parquet file, one row group at a time'''
+
+    schema = parquet_schema()
+    sink = StreamBuffer()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+
+    batch = []
+    for row in export_rows(voters):
+        batch.append(row)
+        if len(batch) >= row_group_size:
+            writer.write_table(pa.Table.from_arrays([pa.array(col) for col in zip(*batch)], schema=schema))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_table(pa.Table.from_arrays([pa.array(col) for col in zip(*batch)], schema=schema))
+    writer.close()
+    yield sink.drain()
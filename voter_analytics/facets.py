@@ -0,0 +1,63 @@
+# File: voter_analytics/facets.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: facet counts for the voter search form, read from VoterSummary
+
+from django.db.models import Sum
+
+from .filters import ELECTIONS, election_bit, parse_filters, participation_values
+from .models import VoterSummary
+
+
+def summary_queryset(filters, skip):
+    '''VoterSummary rows matching every parsed filter except dimension skip'''
+
+    cells = VoterSummary.objects.all()
+    if skip != 'party' and filters['party']:
+        cells = cells.filter(party_code=filters['party'])
+    if skip != 'birth_year' and filters['min_year'] is not None:
+        cells = cells.filter(birth_year__gte=filters['min_year'])
+    if skip != 'birth_year' and filters['max_year'] is not None:
+        cells = cells.filter(birth_year__lte=filters['max_year'])
+    if skip != 'voter_score' and filters['voter_score'] is not None:
+        cells = cells.filter(voter_score=filters['voter_score'])
+    if skip != 'elections' and filters['mask']:
+        cells = cells.filter(participation__in=participation_values(filters['mask'], filters['match_any']))
+    return cells
+
+
+def count_by(filters, dimension, field):
+    '''return {value of field: voters} under every filter but dimension's own'''
+
+    rows = summary_queryset(filters, dimension).values(field).annotate(n=Sum('count')).order_by()
+    return {row[field]: row['n'] for row in rows}
+
+
+def voter_facets(params, years):
+    '''return how many voters each choice on the search form would match,
+    given the other choices already made in params:
+    party code -> n, birth year -> n for "born after" and "born before"
+    (for each year in years), voter score -> n, and election -> n'''
+
+    filters = parse_filters(params)
+    min_year, max_year = filters['min_year'], filters['max_year']
+
+    by_year = count_by(filters, 'birth_year', 'birth_year')
+    born_after = {year: sum(n for y, n in by_year.items() if y >= year and (max_year is None or y <= max_year))
+                  for year in years}
+    born_before = {year: sum(n for y, n in by_year.items() if y <= year and (min_year is None or y >= min_year))
+                   for year in years}
+
+    # checking one more election box narrows (all) or widens (any) the mask
+    by_participation = count_by(filters, 'elections', 'participation')
+    elections = {}
+    for election in ELECTIONS:
+        values = set(participation_values(filters['mask'] | election_bit(election), filters['match_any']))
+        elections[election] = sum(n for value, n in by_participation.items() if value in values)
+
+    return {
+        'party': count_by(filters, 'party', 'party_code'),
+        'born_after': born_after,
+        'born_before': born_before,
+        'voter_score': count_by(filters, 'voter_score', 'voter_score'),
+        'elections': elections,
+    }
@@ -0,0 +1,132 @@
+# File: voter_analytics/filters.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: search-form filters and chart aggregates shared by the
+# voter_analytics views
+
+from datetime import date
+
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractYear
+
+# election participation fields, in the order they appear on the search form;
+# election i is stored as bit (1 << i) of Voter.participation
+ELECTIONS = ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']
+ALL_PARTICIPATION = range(1 << len(ELECTIONS))
+
+
+def election_bit(election):
+    '''return the Voter.participation bit for one of ELECTIONS'''
+
+    return 1 << ELECTIONS.index(election)
+
+
+def participation_from_flags(flags):
+    '''build a participation bitmask from 'TRUE'/'FALSE' strings in ELECTIONS order'''
+
+    mask = 0
+    for i, flag in enumerate(flags):
+        if flag.strip().upper() == 'TRUE':
+            mask |= 1 << i
+    return mask
+
+
+def participation_values(mask, match_any=False):
+    '''return every participation value that voted in all (or, with
+    match_any, at least one) of the elections in mask. There are only 32
+    possible values, so "voted in these elections" becomes a single indexed
+    participation IN (...) predicate.'''
+
+    if match_any:
+        return [value for value in ALL_PARTICIPATION if value & mask]
+    return [value for value in ALL_PARTICIPATION if value & mask == mask]
+
+
+def normalize_party(party):
+    '''return the normalized party code stored in Voter.party_code'''
+
+    return party.strip().upper()
+
+
+def parse_filters(params):
+    '''read the search form parameters in params (usually request.GET)
+    into a dict of party, min_year, max_year, voter_score (None when not
+    set), plus the mask of checked elections and whether any of them
+    (rather than all) must match'''
+
+    party = params.get('party_affiliation')
+    min_birth_year = params.get('min_birth_year')
+    max_birth_year = params.get('max_birth_year')
+    voter_score = params.get('voter_score')
+
+    mask = 0
+    for field in ELECTIONS:
+        if params.get(field):
+            mask |= election_bit(field)
+
+    return {
+        'party': normalize_party(party) if party else None,
+        'min_year': int(min_birth_year) if min_birth_year else None,
+        'max_year': int(max_birth_year) if max_birth_year else None,
+        'voter_score': int(voter_score) if voter_score else None,
+        'mask': mask,
+        'match_any': params.get('elections_match') == 'any',
+    }
+
+
+def filter_voters(voters, params):
+    '''filter a Voter QuerySet using the search form parameters in params
+    (usually request.GET), returning those that satisfy the query'''
+
+    filters = parse_filters(params)
+
+    # filter based on party affiliation
+    if filters['party']:
+        voters = voters.filter(party_code=filters['party'])
+
+    # filter based on minimum birth year
+    if filters['min_year'] is not None:
+        voters = voters.filter(date_of_birth__gte=date(filters['min_year'], 1, 1))
+
+    # filter based on maximum birth year
+    if filters['max_year'] is not None:
+        voters = voters.filter(date_of_birth__lte=date(filters['max_year'], 12, 31))
+
+    # filter based on voter score
+    if filters['voter_score'] is not None:
+        voters = voters.filter(voter_score=filters['voter_score'])
+
+    # filter based on whether they voted in all (or any) of the checked elections
+    if filters['mask']:
+        values = participation_values(filters['mask'], filters['match_any'])
+        voters = voters.filter(participation__in=values)
+
+    return voters
+
+
+def voter_aggregates(voters):
+    '''return the numbers behind the voter graphs for a (filtered) Voter
+    QuerySet, computed with two GROUP BY queries: voters per birth year,
+    and voters plus election turnout per party'''
+
+    by_year = (voters.annotate(year=ExtractYear('date_of_birth'))
+                     .values('year').annotate(n=Count('pk')).order_by('year'))
+    birth_years = {row['year']: row['n'] for row in by_year}
+
+    turnout = {election: Count('pk', filter=Q(participation__in=participation_values(election_bit(election))))
+               for election in ELECTIONS}
+    by_party = (voters.values('party_code').annotate(n=Count('pk'), **turnout)
+                      .order_by('party_code'))
+
+    parties = {}
+    elections = dict.fromkeys(ELECTIONS, 0)
+    for row in by_party:
+        parties[row['party_code']] = row['n']
+        for election in ELECTIONS:
+            elections[election] += row[election]
+
+    return {
+        'total': sum(parties.values()),
+        'birth_years': birth_years,
+        'parties': parties,
+        'elections': elections,
+    }
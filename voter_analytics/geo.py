@@ -0,0 +1,102 @@
+# File: voter_analytics/geo.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: offline address geocoding and a grid spatial index for voters
+
+import bisect
+import csv
+import math
+
+# size of one spatial index cell in degrees (about 550 m of latitude)
+CELL_DEGREES = 0.005
+# offsets keeping row/column numbers positive when packed into one integer
+ROW_OFFSET = 20000
+COL_OFFSET = 50000
+COLS = 100000
+
+EARTH_RADIUS_METERS = 6371000
+
+
+def grid_cell(lat, lon):
+    '''return the spatial index cell containing (lat, lon)'''
+
+    row = math.floor(lat / CELL_DEGREES) + ROW_OFFSET
+    col = math.floor(lon / CELL_DEGREES) + COL_OFFSET
+    return row * COLS + col
+
+
+def cells_around(lat, lon, meters):
+    '''return the grid cells overlapping the box of +/- meters around (lat, lon),
+    and that bounding box as (min_lat, max_lat, min_lon, max_lon)'''
+
+    dlat = math.degrees(meters / EARTH_RADIUS_METERS)
+    dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+    box = (lat - dlat, lat + dlat, lon - dlon, lon + dlon)
+
+    rows = range(math.floor(box[0] / CELL_DEGREES), math.floor(box[1] / CELL_DEGREES) + 1)
+    cols = range(math.floor(box[2] / CELL_DEGREES), math.floor(box[3] / CELL_DEGREES) + 1)
+    cells = [(row + ROW_OFFSET) * COLS + col + COL_OFFSET for row in rows for col in cols]
+    return cells, box
+
+
+def distance_meters(lat1, lon1, lat2, lon2):
+    '''great-circle (haversine) distance between two points'''
+
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+def normalize_street(name):
+    '''upper-case a street name and collapse its whitespace'''
+
+    return ' '.join(name.upper().split())
+
+
+class AddressRanges:
+    '''
+    Offline geocoder built from a local address-range reference file (for
+    example exported from Census TIGER/Line address features), a CSV with
+    the columns street_name, zip_code, from_number, to_number, from_lat,
+    from_lon, to_lat, to_lon. A house number is placed by linear
+    interpolation along the segment whose range contains it.
+    '''
+
+    def __init__(self, path):
+        # (street, zip) -> sorted list of (from_number, to_number, from_lat, from_lon, to_lat, to_lon)
+        self.segments = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                low, high = int(row['from_number']), int(row['to_number'])
+                start = (float(row['from_lat']), float(row['from_lon']))
+                end = (float(row['to_lat']), float(row['to_lon']))
+                if low > high:
+                    low, high, start, end = high, low, end, start
+                key = (normalize_street(row['street_name']), row['zip_code'].strip().zfill(5))
+                self.segments.setdefault(key, []).append((low, high, *start, *end))
+        for segments in self.segments.values():
+            segments.sort()
+        self.starts = {key: [s[0] for s in segments] for key, segments in self.segments.items()}
+        # results per address, since many voters share a building
+        self.cache = {}
+
+    def geocode(self, street_number, street_name, zip_code):
+        '''return (lat, lon) for an address, or None if no range covers it'''
+
+        key = (normalize_street(street_name), str(zip_code).strip().zfill(5))
+        address = (street_number, *key)
+        if address in self.cache:
+            return self.cache[address]
+
+        point = None
+        segments = self.segments.get(key)
+        if segments:
+            i = bisect.bisect_right(self.starts[key], street_number) - 1
+            if i >= 0:
+                low, high, lat1, lon1, lat2, lon2 = segments[i]
+                if street_number <= high:
+                    t = (street_number - low) / (high - low) if high > low else 0.5
+                    point = (lat1 + t * (lat2 - lat1), lon1 + t * (lon2 - lon1))
+        self.cache[address] = point
+        return point
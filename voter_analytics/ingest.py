@@ -0,0 +1,199 @@
+# File: voter_analytics/ingest.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: multi-process, resumable loader for very large voter files
+
+import csv
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.db import transaction
+
+# size of the byte ranges handed to worker processes
+CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def byte_ranges(path, chunk_bytes=CHUNK_BYTES):
+    '''Split a CSV file (after its header row) into (start, end) byte ranges
+    of about chunk_bytes, each ending on a line boundary. The voter file has
+    no quoted newlines, so every line is exactly one row.'''
+
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        f.readline() # skip the header row
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline() # run on to the end of the current line
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def init_worker():
+    '''ProcessPoolExecutor initializer: workers started with spawn or
+    forkserver need Django set up before the models can be imported'''
+
+    if not apps.ready:
+        django.setup()
+
+
+def parse_chunk(path, start, end):
+    '''Worker: parse and validate the rows in bytes [start, end) of path.
+    Returns (rows, rejects, lines), where rows are dicts of Voter field
+    values, rejects are (line within the chunk, reason, fields) and lines is
+    the number of lines in the chunk.'''
+
+    from .models import VOTER_SCHEMA
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode()
+
+    reader = csv.reader(io.StringIO(text, newline=''))
+    rows = []
+    lines = []
+    for fields in reader:
+        rows.append(fields)
+        lines.append(reader.line_num)
+
+    loaded, rejects = VOTER_SCHEMA.convert(rows)
+    return ([values for i, values in loaded],
+            [(lines[i], reason, rows[i]) for i, reason in rejects],
+            reader.line_num)
+
+
+def file_identity(path, chunk_bytes):
+    '''what a checkpoint must match to be resumed: the same file, unchanged,
+    split the same way'''
+
+    stat = os.stat(path)
+    return {'file': os.path.abspath(path), 'size': stat.st_size,
+            'mtime': stat.st_mtime, 'chunk_bytes': chunk_bytes}
+
+
+def read_checkpoint(checkpoint, identity):
+    '''return the saved progress for this file, or None to start over'''
+
+    try:
+        with open(checkpoint) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if any(saved.get(key) != value for key, value in identity.items()):
+        return None
+    return saved
+
+
+def write_checkpoint(checkpoint, identity, offset, lines, stats, errors_pos=None):
+    '''atomically record that everything before byte offset is committed,
+    and how long the errors file was at that point'''
+
+    tmp = f'{checkpoint}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({**identity, 'offset': offset, 'lines': lines, 'stats': stats, 'errors_pos': errors_pos}, f)
+    os.replace(tmp, checkpoint)
+
+
+def parallel_load(filename, batch_size, workers, checkpoint, saved, reject, quarantine, stats, progress,
+                  errors_f=None, chunk_bytes=CHUNK_BYTES, report=print):
+    '''Replace every Voter with the rows of filename, parsing byte ranges of
+    the file in a pool of worker processes (VOTER_SCHEMA.convert) while this
+    process is the only writer.
+
+    At most two chunks per worker are in flight, so a slow database holds
+    back parsing instead of filling memory with parsed rows. Chunks are
+    written in file order, each in its own transaction together with its
+    quarantined rows, and the checkpoint file records how far the load got.
+    saved is the checkpoint read_checkpoint found for this file, or None
+    to start over. Unlike the single-process load_data, other readers can
+    see the table while it is half loaded.
+
+    Each chunk is counted in stats once: a chunk committed just before a
+    crash is not in the checkpoint's stats, and is written (and counted)
+    again on resume, replacing its own rows and quarantined rows. The errors
+    file is cut back to its length at the checkpoint for the same reason.'''
+
+    from loaders.models import RejectedRow
+    from .models import (Voter, insert_voters, rebuild_area_summaries, rebuild_voter_summary,
+                         restore_coordinates, saved_coordinates)
+
+    identity = file_identity(filename, chunk_bytes)
+    if saved:
+        offset, lines = saved['offset'], saved['lines']
+        stats.update(saved['stats'])
+        report(f"Resuming after line {lines} (byte {offset}) using {checkpoint}")
+        # the coordinates of the voters replaced before the crash are gone
+        coordinates = {}
+    else:
+        offset, lines = 0, 1 # the header row
+        coordinates = saved_coordinates()
+        # very dangerous!
+        Voter.objects.all().delete()
+
+    ranges = [(start, end) for start, end in byte_ranges(filename, chunk_bytes) if start >= offset]
+    # the first chunk after a checkpoint may have been committed just before
+    # a crash, in which case its rows are already there
+    resumed_chunk = bool(saved)
+    seen = set()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        pending = deque()
+
+        def submit_next():
+            '''start parsing the next chunk, if any'''
+            if ranges:
+                start, end = ranges.pop(0)
+                pending.append((end, pool.submit(parse_chunk, filename, start, end)))
+
+        while ranges and len(pending) < 2 * workers:
+            submit_next()
+
+        while pending:
+            end, future = pending.popleft()
+            rows, rejects, chunk_lines = future.result()
+            # keep the pool busy while this chunk is written
+            submit_next()
+
+            for line, error, fields in rejects:
+                reject(lines + line, error, fields)
+            # later duplicates of a voter ID win, as in a serial load
+            by_id = {row['voter_id']: Voter(**row) for row in rows}
+            new_ids = [voter_id for voter_id in by_id if voter_id not in seen]
+            if saved and not resumed_chunk:
+                # voters loaded before the crash are not in seen, but are in the table
+                for i in range(0, len(new_ids), batch_size):
+                    seen.update(Voter.objects.filter(voter_id__in=new_ids[i:i + batch_size])
+                                             .values_list('voter_id', flat=True))
+                new_ids = [voter_id for voter_id in new_ids if voter_id not in seen]
+            stats['ungeocoded'] += restore_coordinates(by_id.values(), coordinates)
+            with transaction.atomic():
+                if resumed_chunk:
+                    RejectedRow.objects.filter(source=quarantine.source, line__gt=lines,
+                                               line__lte=lines + chunk_lines).delete()
+                insert_voters(by_id.values(), batch_size=batch_size)
+                quarantine.flush()
+            resumed_chunk = False
+            seen.update(by_id)
+            stats['inserted'] += len(new_ids)
+            stats['updated'] += len(rows) - len(new_ids)
+            lines += chunk_lines
+            errors_pos = None
+            if errors_f:
+                errors_f.flush()
+                errors_pos = errors_f.tell()
+            write_checkpoint(checkpoint, identity, end, lines, stats, errors_pos)
+            progress()
+
+    with transaction.atomic():
+        rebuild_voter_summary()
+        rebuild_area_summaries()
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
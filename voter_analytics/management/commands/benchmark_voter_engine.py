@@ -0,0 +1,65 @@
+# File: voter_analytics/management/commands/benchmark_voter_engine.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: compare the ORM and the NumPy column store on the voter
+# filter+aggregate requests, on a generated voter table
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import QueryDict
+
+from voter_analytics.columnar import VoterColumns, np
+from voter_analytics.filters import filter_voters, voter_aggregates
+from voter_analytics.management.commands.benchmark_voter_indexes import QUERIES, generate_voters
+from voter_analytics.models import Voter
+
+
+def median_ms(func, repeat):
+    '''return the median time in ms of calling func(), and its last result'''
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+class Command(BaseCommand):
+    '''Benchmark voter_aggregates over the ORM against VoterColumns.'''
+
+    help = "Compare ORM and columnar voter aggregates on a generated table (uses a throwaway test database)."
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('--rows', type=int, default=1000000, help="number of voters to generate")
+        parser.add_argument('--repeat', type=int, default=5, help="runs per query (median is reported)")
+
+    def handle(self, *args, **options):
+        '''create a test database, fill it and time both engines'''
+
+        if np is None:
+            raise CommandError("numpy is not installed")
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Generating {options['rows']} voters...")
+            generate_voters(options['rows'])
+
+            build_ms, columns = median_ms(VoterColumns, 1)
+            self.stdout.write(f'Column store built in {build_ms:.0f} ms\n')
+            self.stdout.write(f'{"ORM ms":>10} {"columnar ms":>12}  query')
+
+            for query in QUERIES:
+                params = QueryDict(query)
+                orm_ms, expected = median_ms(
+                    lambda: voter_aggregates(filter_voters(Voter.objects.all(), params)), options['repeat'])
+                columnar_ms, actual = median_ms(lambda: columns.aggregates(params), options['repeat'])
+                check = '' if actual == expected else '  MISMATCH'
+                self.stdout.write(f'{orm_ms:10.1f} {columnar_ms:12.2f}  {query}{check}')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
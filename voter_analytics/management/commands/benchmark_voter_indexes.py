@@ -0,0 +1,119 @@
+# File: voter_analytics/management/commands/benchmark_voter_indexes.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: compare query plans and latency of the voter search filters
+# with and without the Voter indexes, on a generated voter table
+
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import QueryDict
+
+from voter_analytics.filters import ELECTIONS, filter_voters
+from voter_analytics.models import Voter
+
+# search form combinations to time, written as query strings
+QUERIES = [
+    'party_affiliation=R+',
+    'party_affiliation=D+&min_birth_year=1980&max_birth_year=1985',
+    'voter_score=5&min_birth_year=1960',
+    'min_birth_year=1999&max_birth_year=2000',
+    'party_affiliation=U+&voter_score=2&v22general=on',
+    'v20state=on&v22general=on',
+    'v21town=on&v21primary=on&elections_match=any',
+]
+
+PARTIES = ['D ', 'R ', 'U ', 'O ', 'CC', 'L ', 'J ']
+
+
+def generate_voters(n, batch_size=10000):
+    '''fill the (empty) benchmark database with n random voters'''
+
+    rng = random.Random(412)
+    first_day = date(1920, 1, 1)
+    batch = []
+    for i in range(n):
+        flags = [rng.random() < 0.5 for _ in ELECTIONS]
+        party = rng.choice(PARTIES)
+        batch.append(Voter(
+            voter_id=f'{i:09d}', row_hash='',
+            last_name=f'Last{i}', first_name=f'First{i}',
+            street_number=rng.randint(1, 500), street_name='Walnut St',
+            apartment_number=rng.randint(0, 20), zip_code='02458',
+            date_of_birth=first_day + timedelta(days=rng.randint(0, 31000)),
+            date_of_registration=date(2010, 1, 1),
+            party_affiliation=party, party_code=party.strip(),
+            precinct_number=rng.randint(1, 40),
+            participation=sum(1 << bit for bit, flag in enumerate(flags) if flag),
+            voter_score=sum(flags),
+        ))
+        if len(batch) >= batch_size:
+            Voter.objects.bulk_create(batch)
+            batch = []
+    Voter.objects.bulk_create(batch)
+
+
+def time_query(qs, repeat):
+    '''return the median time in ms to count the matches and fetch the first page'''
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        qs.count()
+        list(qs.order_by('pk')[:100])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    '''Benchmark the voter search filters before and after adding indexes.'''
+
+    help = "Benchmark voter search queries with and without indexes on a generated table (uses a throwaway test database)."
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('--rows', type=int, default=500000, help="number of voters to generate")
+        parser.add_argument('--repeat', type=int, default=5, help="runs per query (median is reported)")
+
+    def handle(self, *args, **options):
+        '''create a test database, fill it and time each query twice'''
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Generating {options['rows']} voters...")
+            generate_voters(options['rows'])
+
+            with connection.schema_editor() as editor:
+                for index in Voter._meta.indexes:
+                    editor.remove_index(Voter, index)
+            before = self.run_queries('without indexes', options['repeat'])
+
+            with connection.schema_editor() as editor:
+                for index in Voter._meta.indexes:
+                    editor.add_index(Voter, index)
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            after = self.run_queries('with indexes', options['repeat'])
+
+            self.stdout.write('\nSummary (median ms, before -> after):')
+            for query in QUERIES:
+                self.stdout.write(f'  {before[query]:8.1f} -> {after[query]:8.1f}  {query}')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_queries(self, label, repeat):
+        '''print the plan and latency of every query, returning the timings'''
+
+        self.stdout.write(f'\n=== {label} ===')
+        timings = {}
+        for query in QUERIES:
+            qs = filter_voters(Voter.objects.all(), QueryDict(query))
+            timings[query] = time_query(qs, repeat)
+            self.stdout.write(f'\n{query}: {timings[query]:.1f} ms')
+            self.stdout.write(qs.explain())
+        return timings
@@ -0,0 +1,26 @@
+# File: voter_analytics/management/commands/build_voter_summaries.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: manage.py command to rebuild the precomputed voter summaries
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cs412.charts import bump_dataset_version
+from voter_analytics.models import AreaSummary, VoterSummary, rebuild_area_summaries, rebuild_voter_summary
+
+
+class Command(BaseCommand):
+    '''Recompute VoterSummary and AreaSummary from the Voter table.'''
+
+    help = "Rebuild the facet and precinct/zip code summary tables from the current voters."
+
+    def handle(self, *args, **options):
+        '''rebuild both summaries in one transaction'''
+
+        with transaction.atomic():
+            rebuild_voter_summary()
+            rebuild_area_summaries()
+        bump_dataset_version('voters')
+
+        self.stdout.write(f"Built {VoterSummary.objects.count()} facet cells and "
+                          f"{AreaSummary.objects.count()} precinct/zip code summaries")
@@ -0,0 +1,58 @@
+# File: voter_analytics/management/commands/geocode_voters.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: manage.py command to geocode voter addresses offline from an
+# address-range reference file
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cs412.charts import bump_dataset_version
+from voter_analytics.geo import AddressRanges, grid_cell
+from voter_analytics.models import BATCH_SIZE, Voter
+
+
+class Command(BaseCommand):
+    '''Fill Voter.latitude/longitude/geo_cell by interpolating along address ranges.'''
+
+    help = ("Geocode voters from a local address-range CSV (street_name, zip_code, from_number, "
+            "to_number, from_lat, from_lon, to_lat, to_lon). Only voters without coordinates "
+            "are geocoded unless --all is given.")
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('reference', help="path to the address-range reference CSV")
+        parser.add_argument('--all', action='store_true', help="re-geocode voters that already have coordinates")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="voters updated per query")
+
+    def handle(self, *args, **options):
+        '''geocode voters in batches, reporting how many addresses matched'''
+
+        ranges = AddressRanges(options['reference'])
+        voters = Voter.objects.only('pk', 'street_number', 'street_name', 'zip_code').order_by('pk')
+        if not options['all']:
+            voters = voters.filter(latitude__isnull=True)
+
+        matched = unmatched = 0
+        batch = []
+        with transaction.atomic():
+            for voter in voters.iterator(chunk_size=options['batch_size']):
+                point = ranges.geocode(voter.street_number, voter.street_name, voter.zip_code)
+                if point is None:
+                    unmatched += 1
+                    if not options['all']:
+                        continue
+                    voter.latitude = voter.longitude = voter.geo_cell = None
+                else:
+                    matched += 1
+                    voter.latitude, voter.longitude = point
+                    voter.geo_cell = grid_cell(*point)
+                batch.append(voter)
+                if len(batch) >= options['batch_size']:
+                    Voter.objects.bulk_update(batch, ['latitude', 'longitude', 'geo_cell'])
+                    batch = []
+            Voter.objects.bulk_update(batch, ['latitude', 'longitude', 'geo_cell'])
+        bump_dataset_version('voters')
+
+        self.stdout.write(f"Geocoded {matched} voters ({len(ranges.cache)} distinct addresses); "
+                          f"{unmatched} addresses not covered by the reference file")
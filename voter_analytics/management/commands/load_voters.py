@@ -0,0 +1,41 @@
+# File: voter_analytics/management/commands/load_voters.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: manage.py command to (re)load the voter file into the database
+
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.models import load_data, VOTER_CSV, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    '''Stream a voter CSV file into the Voter table in batches.'''
+
+    help = "Load voters from a CSV file using batched bulk inserts."
+
+    def add_arguments(self, parser):
+        '''define command line arguments'''
+
+        parser.add_argument('path', nargs='?', default=VOTER_CSV,
+                            help=f"voter CSV file (default: {VOTER_CSV})")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f"rows per bulk insert (default: {BATCH_SIZE})")
+        parser.add_argument('--errors', metavar='FILE',
+                            help="write rejected rows and the reason to this CSV file")
+        parser.add_argument('--sync', action='store_true',
+                            help="only insert/update/delete voters that changed since the last load")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="parse the file in this many processes, committing chunk by chunk (full loads only)")
+        parser.add_argument('--checkpoint', metavar='FILE',
+                            help="progress file used to resume a --workers load (default: <path>.checkpoint)")
+
+    def handle(self, *args, **options):
+        '''run the loader, reporting progress on stdout'''
+
+        if options['workers'] > 1 and options['sync']:
+            raise CommandError("--sync cannot be combined with --workers")
+        load_data(filename=options['path'],
+                  batch_size=options['batch_size'],
+                  error_file=options['errors'],
+                  report=self.stdout.write,
+                  sync=options['sync'],
+                  workers=options['workers'],
+                  checkpoint=options['checkpoint'])
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "voter_analytics",
+            "0005_alter_voter_v20state_alter_voter_v21primary_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voter",
+            name="row_hash",
+            field=models.CharField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="voter_id",
+            field=models.CharField(null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+from django.db import migrations, models
+from django.db.models.functions import Trim, Upper
+
+
+def fill_party_code(apps, schema_editor):
+    """Normalize party_affiliation into party_code for existing voters."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    Voter.objects.update(party_code=Upper(Trim("party_affiliation")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0006_voter_voter_id_voter_row_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voter",
+            name="party_code",
+            field=models.CharField(blank=True),
+        ),
+        migrations.RunPython(fill_party_code, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["party_code", "date_of_birth"], name="voter_party_dob_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["voter_score", "date_of_birth"], name="voter_score_dob_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(fields=["date_of_birth"], name="voter_dob_idx"),
+        ),
+    ]
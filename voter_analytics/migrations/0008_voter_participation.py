@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:41
+
+from django.db import migrations, models
+from django.db.models import F
+
+ELECTIONS = ["v20state", "v21town", "v21primary", "v22general", "v23town"]
+
+
+def fill_participation(apps, schema_editor):
+    """Fold the 'TRUE'/'FALSE' election columns into the participation bitmask."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    for i, election in enumerate(ELECTIONS):
+        Voter.objects.filter(**{f"{election}__iexact": "TRUE"}).update(
+            participation=F("participation") + (1 << i)
+        )
+
+
+def unfill_participation(apps, schema_editor):
+    """Rebuild the 'TRUE'/'FALSE' election columns from the bitmask."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    for i, election in enumerate(ELECTIONS):
+        voters = Voter.objects.annotate(voted=F("participation").bitand(1 << i))
+        voters.filter(voted__gt=0).update(**{election: "TRUE"})
+        voters.filter(voted=0).update(**{election: "FALSE"})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0007_voter_party_code_and_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voter",
+            name="participation",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_participation, unfill_participation),
+        # a default lets migrating backwards re-add the columns before
+        # unfill_participation sets them
+        migrations.AlterField(
+            model_name="voter",
+            name="v20state",
+            field=models.TextField(default="FALSE"),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="v21town",
+            field=models.TextField(default="FALSE"),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="v21primary",
+            field=models.TextField(default="FALSE"),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="v22general",
+            field=models.TextField(default="FALSE"),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="v23town",
+            field=models.TextField(default="FALSE"),
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="v20state",
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="v21primary",
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="v21town",
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="v22general",
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="v23town",
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["participation"], name="voter_participation_idx"
+            ),
+        ),
+    ]
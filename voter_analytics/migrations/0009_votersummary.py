@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:46
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+
+def build_summary(apps, schema_editor):
+    """Count the voters already loaded into VoterSummary."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    VoterSummary = apps.get_model("voter_analytics", "VoterSummary")
+    cells = (
+        Voter.objects.annotate(birth_year=ExtractYear("date_of_birth"))
+        .values("party_code", "birth_year", "voter_score", "participation")
+        .annotate(n=Count("pk"))
+        .order_by()
+    )
+    VoterSummary.objects.bulk_create(
+        VoterSummary(
+            party_code=cell["party_code"],
+            birth_year=cell["birth_year"],
+            voter_score=cell["voter_score"],
+            participation=cell["participation"],
+            count=cell["n"],
+        )
+        for cell in cells
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0008_voter_participation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VoterSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("party_code", models.CharField(blank=True)),
+                ("birth_year", models.IntegerField()),
+                ("voter_score", models.IntegerField()),
+                ("participation", models.PositiveSmallIntegerField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "party_code",
+                            "birth_year",
+                            "voter_score",
+                            "participation",
+                        ),
+                        name="voter_summary_cell",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
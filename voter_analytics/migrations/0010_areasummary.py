@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+ELECTIONS = ["v20state", "v21town", "v21primary", "v22general", "v23town"]
+
+
+def build_area_summaries(apps, schema_editor):
+    """Summarize the voters already loaded into AreaSummary."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    AreaSummary = apps.get_model("voter_analytics", "AreaSummary")
+    summaries = []
+    for kind, field in [("precinct", "precinct_number"), ("zip", "zip_code")]:
+        areas = {}
+        cells = (
+            Voter.objects.values(field, "party_code", "voter_score", "participation")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        for cell in cells:
+            area = str(cell[field])
+            if area not in areas:
+                areas[area] = AreaSummary(
+                    kind=kind,
+                    area=area,
+                    voters=0,
+                    turnout=dict.fromkeys(ELECTIONS, 0),
+                    party_mix={},
+                    score_distribution={},
+                )
+            summary = areas[area]
+            n = cell["n"]
+            summary.voters += n
+            party, score = cell["party_code"], str(cell["voter_score"])
+            summary.party_mix[party] = summary.party_mix.get(party, 0) + n
+            summary.score_distribution[score] = (
+                summary.score_distribution.get(score, 0) + n
+            )
+            for i, election in enumerate(ELECTIONS):
+                if cell["participation"] & (1 << i):
+                    summary.turnout[election] += n
+        summaries.extend(areas.values())
+    AreaSummary.objects.bulk_create(summaries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0009_votersummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AreaSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("precinct", "Precinct"), ("zip", "Zip code")]
+                    ),
+                ),
+                ("area", models.CharField()),
+                ("voters", models.IntegerField(default=0)),
+                ("turnout", models.JSONField(default=dict)),
+                ("party_mix", models.JSONField(default=dict)),
+                ("score_distribution", models.JSONField(default=dict)),
+            ],
+            options={
+                "ordering": ["kind", "area"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "area"), name="area_summary_area"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_area_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0010_areasummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voter",
+            name="geo_cell",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(fields=["geo_cell"], name="voter_geo_cell_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["precinct_number", "latitude", "longitude"],
+                name="voter_precinct_geo_idx",
+            ),
+        ),
+    ]
@@ -2,7 +2,20 @@
 # Author: Zacharie Verdieu (zverdieu@bu.edu), 10/31/2025
 # Description: FFile creating models for voter_analytics application
 
-from django.db import models
+import csv
+import hashlib
+import os
+import time
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import ExtractYear
+
+from cs412.charts import bump_dataset_version
+from . import geo
+from .filters import ELECTIONS, election_bit, normalize_party, participation_from_flags
+from loaders.schema import Column, Quarantine, Schema, parse_date, parse_int
 
 # Create your models here.
 class Voter(models.Model):
@@ -10,6 +23,11 @@ class Voter(models.Model):
     Store/represent the data from one voter in Massachusetts.
     '''
 
+    # Voter ID from the first column of the voter file, and a hash of the
+    # whole CSV row so an incremental reload can tell which voters changed
+    voter_id = models.CharField(unique=True, null=True)
+    row_hash = models.CharField(blank=True)
+
     # Voter Name
     last_name = models.TextField()
     first_name = models.TextField()
@@ -26,66 +44,570 @@ class Voter(models.Model):
 
     # Party + Precinct
     party_affiliation = models.CharField()
+    # party_affiliation stripped and upper-cased, so party filters can use
+    # an index instead of a case-insensitive scan
+    party_code = models.CharField(blank=True)
     precinct_number = models.IntegerField()
 
-    # Election Participation
-    v20state = models.TextField()
-    v21town = models.TextField()
-    v21primary = models.TextField()
-    v22general = models.TextField()
-    v23town = models.TextField()
+    # Election Participation, one bit per election in ELECTIONS
+    participation = models.PositiveSmallIntegerField(default=0)
 
     voter_score = models.IntegerField()
 
+    # Location from the offline geocoder (geocode_voters), and the spatial
+    # grid cell it falls in (see geo.py); empty until geocoded
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        # chosen for the search form: party and/or score narrowed by a
+        # birth-year range, or a birth-year range on its own
+        indexes = [
+            models.Index(fields=['party_code', 'date_of_birth'], name='voter_party_dob_idx'),
+            models.Index(fields=['voter_score', 'date_of_birth'], name='voter_score_dob_idx'),
+            models.Index(fields=['date_of_birth'], name='voter_dob_idx'),
+            models.Index(fields=['participation'], name='voter_participation_idx'),
+            models.Index(fields=['geo_cell'], name='voter_geo_cell_idx'),
+            # covers the per-precinct map, which only needs coordinates
+            models.Index(fields=['precinct_number', 'latitude', 'longitude'], name='voter_precinct_geo_idx'),
+        ]
+
     def __str__(self):
         ''' returns a string representation of a Voter object'''
 
         return f'{self.first_name} {self.last_name}, member of the {self.party_affiliation} party, registered in {self.date_of_registration}, voter score: {self.voter_score}'
 
-def load_data():
-    '''Function to load data records from CSV file into the Django database.'''
+    @classmethod
+    def near(cls, lat, lon, meters, voters=None):
+        '''return [(distance in meters, voter)] for geocoded voters within
+        meters of (lat, lon), nearest first. Candidates come from the grid
+        cells around the point (an indexed geo_cell IN (...) lookup), and
+        only those are checked against the exact distance.'''
+
+        if voters is None:
+            voters = cls.objects.all()
+        cells, (min_lat, max_lat, min_lon, max_lon) = geo.cells_around(lat, lon, meters)
+        if len(cells) <= 1000:
+            voters = voters.filter(geo_cell__in=cells)
+        candidates = voters.filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+
+        found = []
+        for voter in candidates:
+            distance = geo.distance_meters(lat, lon, voter.latitude, voter.longitude)
+            if distance <= meters:
+                found.append((distance, voter))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def voted_in(self, election):
+        '''return True if this voter took part in election (one of ELECTIONS)'''
+
+        return bool(self.participation & election_bit(election))
+
+    @property
+    def v20state(self):
+        '''did this voter vote in the 2020 state election'''
+        return self.voted_in('v20state')
+
+    @property
+    def v21town(self):
+        '''did this voter vote in the 2021 town election'''
+        return self.voted_in('v21town')
+
+    @property
+    def v21primary(self):
+        '''did this voter vote in the 2021 primary'''
+        return self.voted_in('v21primary')
+
+    @property
+    def v22general(self):
+        '''did this voter vote in the 2022 general election'''
+        return self.voted_in('v22general')
+
+    @property
+    def v23town(self):
+        '''did this voter vote in the 2023 town election'''
+        return self.voted_in('v23town')
+
+class VoterSummary(models.Model):
+    '''
+    Number of voters sharing one combination of the search form's filter
+    dimensions. Facet counts are summed from these few thousand rows instead
+    of scanning Voter; the table is rebuilt or adjusted by load_data.
+    '''
+
+    party_code = models.CharField(blank=True)
+    birth_year = models.IntegerField()
+    voter_score = models.IntegerField()
+    participation = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['party_code', 'birth_year', 'voter_score', 'participation'],
+                                    name='voter_summary_cell'),
+        ]
+
+    def __str__(self):
+        ''' returns a string representation of a VoterSummary object'''
+
+        return f'{self.count} voters: party {self.party_code}, born {self.birth_year}, score {self.voter_score}, participation {self.participation}'
+
+
+def summary_cell(party_code, date_of_birth, voter_score, participation):
+    '''return the VoterSummary key a voter with these values is counted under'''
+
+    return (party_code, date_of_birth.year, voter_score, participation)
+
+
+def rebuild_voter_summary():
+    '''recount VoterSummary from scratch with one GROUP BY over Voter'''
+
+    VoterSummary.objects.all().delete()
+    cells = (Voter.objects.annotate(birth_year=ExtractYear('date_of_birth'))
+                          .values('party_code', 'birth_year', 'voter_score', 'participation')
+                          .annotate(n=Count('pk')).order_by())
+    VoterSummary.objects.bulk_create(
+        VoterSummary(party_code=cell['party_code'], birth_year=cell['birth_year'],
+                     voter_score=cell['voter_score'], participation=cell['participation'],
+                     count=cell['n'])
+        for cell in cells
+    )
+
+
+def apply_summary_deltas(deltas):
+    '''adjust VoterSummary by a Counter of {cell: change in voters}, so an
+    incremental reload only touches the cells whose voters changed'''
+
+    for (party_code, birth_year, voter_score, participation), delta in deltas.items():
+        if not delta:
+            continue
+        cell = VoterSummary.objects.filter(party_code=party_code, birth_year=birth_year,
+                                           voter_score=voter_score, participation=participation)
+        if not cell.update(count=F('count') + delta):
+            VoterSummary.objects.create(party_code=party_code, birth_year=birth_year,
+                                        voter_score=voter_score, participation=participation,
+                                        count=delta)
+    VoterSummary.objects.filter(count__lte=0).delete()
+
+
+class AreaSummary(models.Model):
+    '''
+    Precomputed turnout, party mix and voter score distribution for one
+    precinct or zip code, so area dashboards read a few hundred rows instead
+    of scanning every voter. Rebuilt by a full load_data and by
+    build_voter_summaries, and adjusted in place by a sync.
+    '''
+
+    KINDS = [('precinct', 'Precinct'), ('zip', 'Zip code')]
+
+    kind = models.CharField(choices=KINDS)
+    area = models.CharField()
+    voters = models.IntegerField(default=0)
+    # {election: voters who took part}, {party code: voters}, {score: voters}
+    turnout = models.JSONField(default=dict)
+    party_mix = models.JSONField(default=dict)
+    score_distribution = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'area'], name='area_summary_area'),
+        ]
+        ordering = ['kind', 'area']
+
+    def __str__(self):
+        ''' returns a string representation of an AreaSummary object'''
+
+        return f'{self.get_kind_display()} {self.area}: {self.voters} voters'
+
+    def turnout_rates(self):
+        '''return [(election, percent of voters who took part)] in ELECTIONS order'''
+
+        return [(election, 100 * self.turnout.get(election, 0) / self.voters if self.voters else 0)
+                for election in ELECTIONS]
+
+    def average_score(self):
+        '''return the mean voter score in this area'''
+
+        total = sum(int(score) * n for score, n in self.score_distribution.items())
+        return total / self.voters if self.voters else 0
+
+
+def rebuild_area_summaries():
+    '''recompute AreaSummary for every precinct and zip code, with one
+    GROUP BY query per kind of area'''
+
+    summaries = []
+    for kind, field in [('precinct', 'precinct_number'), ('zip', 'zip_code')]:
+        areas = {}
+        cells = (Voter.objects.values(field, 'party_code', 'voter_score', 'participation')
+                              .annotate(n=Count('pk')).order_by())
+        for cell in cells:
+            area = str(cell[field])
+            if area not in areas:
+                areas[area] = AreaSummary(kind=kind, area=area, turnout=dict.fromkeys(ELECTIONS, 0))
+            add_to_area(areas[area], cell['party_code'], cell['voter_score'], cell['participation'], cell['n'])
+        summaries.extend(areas.values())
+
+    AreaSummary.objects.all().delete()
+    AreaSummary.objects.bulk_create(summaries)
+
+
+def add_to_area(summary, party_code, voter_score, participation, n):
+    '''count n more (or, if negative, fewer) voters with these values in an
+    AreaSummary, dropping party and score entries that fall to zero'''
+
+    summary.voters += n
+    for counts, key in [(summary.party_mix, party_code), (summary.score_distribution, str(voter_score))]:
+        counts[key] = counts.get(key, 0) + n
+        if not counts[key]:
+            del counts[key]
+    for election in ELECTIONS:
+        if participation & election_bit(election):
+            summary.turnout[election] = summary.turnout.get(election, 0) + n
+
+
+def area_cell(precinct_number, zip_code, party_code, voter_score, participation):
+    '''return the key under which load_data counts changes to AreaSummary'''
+
+    return (str(precinct_number), zip_code, party_code, voter_score, participation)
+
+
+def apply_area_deltas(deltas):
+    '''adjust AreaSummary by a Counter of {area_cell: change in voters}, so
+    an incremental reload only rewrites the precincts and zip codes it touched'''
+
+    changes = {}
+    for (precinct, zip_code, party_code, voter_score, participation), delta in deltas.items():
+        if delta:
+            for area in [('precinct', precinct), ('zip', zip_code)]:
+                changes.setdefault(area, []).append((party_code, voter_score, participation, delta))
+    if not changes:
+        return
 
+    existing = {(summary.kind, summary.area): summary
+                for summary in AreaSummary.objects.filter(area__in={area for kind, area in changes})}
+    created = []
+    for (kind, area), cells in changes.items():
+        summary = existing.get((kind, area))
+        if summary is None:
+            summary = AreaSummary(kind=kind, area=area, turnout=dict.fromkeys(ELECTIONS, 0))
+            created.append(summary)
+        for cell in cells:
+            add_to_area(summary, *cell)
+
+    AreaSummary.objects.bulk_create(created)
+    updated = [summary for key, summary in existing.items() if key in changes]
+    AreaSummary.objects.bulk_update(updated, ['voters', 'turnout', 'party_mix', 'score_distribution'])
+    AreaSummary.objects.filter(voters__lte=0).delete()
+
+
+# default location of the voter file and number of rows written per INSERT
+VOTER_CSV = 'newton_voters.csv'
+BATCH_SIZE = 5000
+
+# fields rewritten when an incremental reload finds a changed row
+SYNC_FIELDS = [
+    'row_hash', 'last_name', 'first_name',
+    'street_number', 'street_name', 'apartment_number', 'zip_code',
+    'date_of_birth', 'date_of_registration', 'party_affiliation', 'party_code', 'precinct_number',
+    'participation', 'voter_score',
+    # kept by restore_coordinates unless the address changed, in which case
+    # they are cleared until geocode_voters runs again
+    'latitude', 'longitude', 'geo_cell',
+]
+
+# the address geocode_voters reads, and the values it fills in
+ADDRESS_FIELDS = ['street_number', 'street_name', 'zip_code']
+GEO_FIELDS = ['latitude', 'longitude', 'geo_cell']
+
+
+# Voter fields that decide which VoterSummary cell a voter is counted in
+SUMMARY_FIELDS = ['party_code', 'date_of_birth', 'voter_score', 'participation']
+# and which AreaSummary rows (see area_cell)
+AREA_FIELDS = ['precinct_number', 'zip_code', 'party_code', 'voter_score', 'participation']
+
+
+def saved_coordinates():
+    '''{voter_id: ADDRESS_FIELDS + GEO_FIELDS values} for every geocoded
+    voter, so a full load can put coordinates back after replacing the table'''
+
+    rows = Voter.objects.filter(latitude__isnull=False).values_list('voter_id', *ADDRESS_FIELDS, *GEO_FIELDS)
+    return {voter_id: tuple(place) for voter_id, *place in rows.iterator(chunk_size=10000)}
+
+
+def restore_coordinates(voters, saved):
+    '''Copy coordinates from saved (as returned by saved_coordinates) onto
+    unsaved Voters whose address is unchanged. Returns the number of voters
+    left without coordinates.'''
+
+    missing = 0
+    for voter in voters:
+        place = saved.get(voter.voter_id)
+        if place and tuple(getattr(voter, f) for f in ADDRESS_FIELDS) == place[:len(ADDRESS_FIELDS)]:
+            voter.latitude, voter.longitude, voter.geo_cell = place[len(ADDRESS_FIELDS):]
+        else:
+            missing += 1
+    return missing
+
+
+def insert_voters(voters, batch_size=None):
+    '''bulk insert Voters, overwriting any row that already has one of their
+    voter IDs instead of failing on the unique constraint'''
+
+    Voter.objects.bulk_create(voters, batch_size=batch_size, update_conflicts=True,
+                              unique_fields=['voter_id'], update_fields=SYNC_FIELDS)
+
+
+def row_hash(fields):
+    '''Return a short fingerprint of one CSV row.'''
+
+    return hashlib.sha1('\x1f'.join(fields).encode()).hexdigest()
+
+
+def _after_voter_reingest():
+    '''refresh what is derived from the Voter table after rejects are loaded'''
+
+    rebuild_voter_summary()
+    rebuild_area_summaries()
+    bump_dataset_version('voters')
+
+
+# layout of the voter CSV file
+VOTER_SCHEMA = Schema('voters', Voter, [
+    Column('voter_id', 0),
+    Column('last_name', 1),
+    Column('first_name', 2),
+    Column('street_number', 3, parse_int),
+    Column('street_name', 4),
+    Column('apartment_number', 5, parse_int),
+    Column('zip_code', 6),
+    Column('date_of_birth', 7, parse_date),
+    Column('date_of_registration', 8, parse_date),
+    Column('party_affiliation', 9),
+    Column('precinct_number', 10, parse_int),
+    Column('voter_score', 16, parse_int),
+], derived=[
+    ('row_hash', row_hash),
+    ('party_code', lambda fields: normalize_party(fields[9])),
+    ('participation', lambda fields: participation_from_flags(fields[11:16])),
+], insert=insert_voters, after_reingest=_after_voter_reingest)
+
+
+def read_batches(f, batch_size, reject):
+    '''Yield lists of at most batch_size Voters parsed from an open CSV file,
+    so the whole file is never held in memory. Rows that do not fit
+    VOTER_SCHEMA are passed to reject(line_number, reason, fields) instead.'''
+
+    reader = csv.reader(f)
+    next(reader, None) # skip the header row
+
+    rows = []
+    lines = []
+    for fields in reader:
+        rows.append(fields)
+        lines.append(reader.line_num)
+        if len(rows) >= batch_size:
+            yield _convert_batch(rows, lines, reject)
+            rows = []
+            lines = []
+    if rows:
+        yield _convert_batch(rows, lines, reject)
+
+
+def _convert_batch(rows, lines, reject):
+    '''convert a batch of CSV rows into Voters, rejecting the bad ones'''
+
+    voters, rejects = VOTER_SCHEMA.instances(rows)
+    for i, reason in rejects:
+        reject(lines[i], reason, rows[i])
+    return voters
+
+
+def _full_load(batches, stats, progress):
+    '''Replace every Voter with the rows from the file. As in _sync, when a
+    voter ID appears more than once the later row wins (counted as updated).
+    Voters whose address is unchanged keep their coordinates.'''
+
+    saved = saved_coordinates()
     # very dangerous!
     Voter.objects.all().delete()
 
-    filename = 'newton_voters.csv'
-    f = open(filename, 'r') # open the file in readmode
-    f.readline() # just skips first line of csv
-
-    # This for loop attempts to store as much data from the csv as possible
-    # adds records that do not cause any errors (empty fields, etc.)
-    # displays an error message when an issue occurs
-    for line in f:
-        try:
-            fields = line.strip().split(',')
-
-            # defining a Voter object for current line in csv
-            voter = Voter(
-                last_name = fields[1],
-                first_name = fields[2],
-                
-                street_number = fields[3],
-                street_name = fields[4],
-                apartment_number = fields[5],
-                zip_code = fields[6],
-                
-                date_of_birth = fields[7],
-                date_of_registration = fields[8],
-                
-                party_affiliation = fields[9],
-                precinct_number = fields[10],
-
-                v20state = fields[11],
-                v21town = fields[12],
-                v21primary = fields[13],
-                v22general = fields[14],
-                v23town = fields[15],
-                voter_score = fields[16],
-            )
-            voter.save()
-
-        except:
-            print("Something went wrong!")
-            print(f"line={line}")
-
-    print(f"Created: {len(Voter.objects.all())} Results") # display added count
\ No newline at end of file
+    seen = set()
+    for voters in batches:
+        by_id = {v.voter_id: v for v in voters}
+        stats['ungeocoded'] += restore_coordinates(by_id.values(), saved)
+        insert_voters(by_id.values())
+        inserted = sum(1 for voter_id in by_id if voter_id not in seen)
+        seen.update(by_id)
+        stats['inserted'] += inserted
+        stats['updated'] += len(voters) - inserted
+        progress()
+
+    rebuild_voter_summary()
+    # precinct and zip code dashboards
+    rebuild_area_summaries()
+
+
+def _sync(batches, stats, progress, batch_size):
+    '''Bring the Voter table in line with the file, touching only the rows
+    whose voter ID is new, whose contents changed, or which have gone.
+    VoterSummary and AreaSummary are adjusted by the same changes.'''
+
+    seen = set()
+    # change in voters per VoterSummary cell and per area_cell
+    deltas = Counter()
+    area_deltas = Counter()
+
+    def count(values, change):
+        '''record change (+1 or -1) for a voter with these SUMMARY_FIELDS
+        then AREA_FIELDS values'''
+        deltas[summary_cell(*values[:len(SUMMARY_FIELDS)])] += change
+        area_deltas[area_cell(*values[len(SUMMARY_FIELDS):])] += change
+
+    def values(voter):
+        '''the SUMMARY_FIELDS then AREA_FIELDS values of an unsaved Voter'''
+        return [getattr(voter, f) for f in SUMMARY_FIELDS + AREA_FIELDS]
+
+    for voters in batches:
+        # later duplicates of a voter ID in the same batch win
+        by_id = {v.voter_id: v for v in voters}
+        seen.update(by_id)
+
+        places = len(ADDRESS_FIELDS + GEO_FIELDS)
+        existing = Voter.objects.filter(voter_id__in=by_id).values_list(
+            'voter_id', 'pk', 'row_hash', *ADDRESS_FIELDS, *GEO_FIELDS, *SUMMARY_FIELDS, *AREA_FIELDS)
+        changed = []
+        old_places = {}
+        for voter_id, pk, old_hash, *old_values in existing:
+            voter = by_id.pop(voter_id)
+            if voter.row_hash != old_hash:
+                voter.pk = pk
+                changed.append(voter)
+                old_places[voter_id] = tuple(old_values[:places])
+                count(old_values[places:], -1)
+                count(values(voter), 1)
+            else:
+                stats['unchanged'] += 1
+        # a changed voter who has not moved keeps their coordinates
+        stats['ungeocoded'] += restore_coordinates(changed, old_places)
+
+        # whatever is left in by_id was not in the table yet
+        for voter in by_id.values():
+            count(values(voter), 1)
+        stats['ungeocoded'] += len(by_id)
+        Voter.objects.bulk_create(by_id.values())
+        Voter.objects.bulk_update(changed, SYNC_FIELDS, batch_size=batch_size)
+        stats['inserted'] += len(by_id)
+        stats['updated'] += len(changed)
+        progress()
+
+    # delete voters that are no longer in the file (including legacy rows
+    # loaded before voter IDs were kept)
+    stale = []
+    for pk, voter_id, *old_values in Voter.objects.values_list(
+            'pk', 'voter_id', *SUMMARY_FIELDS, *AREA_FIELDS).iterator():
+        if voter_id not in seen:
+            stale.append(pk)
+            count(old_values, -1)
+    for i in range(0, len(stale), batch_size):
+        Voter.objects.filter(pk__in=stale[i:i + batch_size]).delete()
+    stats['deleted'] = len(stale)
+
+    apply_summary_deltas(deltas)
+    apply_area_deltas(area_deltas)
+
+
+def load_data(filename=VOTER_CSV, batch_size=BATCH_SIZE, error_file=None, report=print, sync=False,
+              workers=1, checkpoint=None):
+    '''Function to load data records from CSV file into the Django database.
+
+    The file is streamed in batches of batch_size rows and written with bulk
+    statements inside one transaction, so readers never see a half-loaded
+    table. By default every Voter is replaced; with sync=True only new,
+    changed and removed voters (matched on voter ID) are written. Rows that
+    do not fit VOTER_SCHEMA are skipped and quarantined as RejectedRow (see
+    manage.py reingest_rejects) and, if error_file is given, written there
+    with the reason. Voters whose address did not change keep their
+    coordinates; the others are counted in 'ungeocoded' and reported, as
+    geocode_voters has to place them. Returns a dict of row counts.
+
+    With workers > 1 the file is parsed by that many processes and loaded
+    chunk by chunk, recording progress in checkpoint (default: the file
+    name plus '.checkpoint') so an interrupted load can be resumed; see
+    ingest.parallel_load. This is only supported for full loads.'''
+
+    if workers > 1 and sync:
+        raise ValueError("sync loads run in a single process; use workers=1")
+    saved = None
+    if workers > 1:
+        from .ingest import CHUNK_BYTES, file_identity, read_checkpoint
+        checkpoint = checkpoint or f'{filename}.checkpoint'
+        # a checkpoint for another file, or for this file before it changed, is ignored
+        saved = read_checkpoint(checkpoint, file_identity(filename, CHUNK_BYTES))
+    resuming = saved is not None
+
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0, 'rejected': 0, 'ungeocoded': 0}
+    # only worth a warning if the voters have been geocoded before
+    geocoded = Voter.objects.filter(latitude__isnull=False).exists()
+    start = time.monotonic()
+
+    errors_f = None
+    errors = None
+    if error_file:
+        errors_pos = saved.get('errors_pos') if resuming else None
+        if errors_pos is not None and os.path.exists(error_file):
+            # a resumed load adds to the rows rejected before the checkpoint
+            errors_f = open(error_file, 'a', newline='')
+            errors_f.truncate(errors_pos)
+            errors = csv.writer(errors_f)
+        else:
+            errors_f = open(error_file, 'w', newline='')
+            errors = csv.writer(errors_f)
+            errors.writerow(['line', 'error', 'fields'])
+
+    # rejected rows also go to the RejectedRow table, see reingest_rejects
+    quarantine = Quarantine(VOTER_SCHEMA.name, filename, clear=not resuming)
+
+    def reject(line_num, reason, fields):
+        '''count (and report) a row that could not be converted'''
+        stats['rejected'] += 1
+        quarantine.add(line_num, reason, fields)
+        if errors:
+            errors.writerow([line_num, reason] + fields)
+
+    def progress():
+        '''report rows processed so far and throughput'''
+        quarantine.flush()
+        done = stats['inserted'] + stats['updated'] + stats['unchanged']
+        elapsed = max(time.monotonic() - start, 1e-6)
+        report(f"Processed {done} voters, rejected {stats['rejected']} ({done / elapsed:.0f} rows/s)")
+
+    try:
+        if workers > 1:
+            from .ingest import parallel_load
+            parallel_load(filename, batch_size, workers, checkpoint, saved, reject, quarantine, stats, progress,
+                          errors_f=errors_f, chunk_bytes=CHUNK_BYTES, report=report)
+        else:
+            with open(filename, 'r', newline='') as f, transaction.atomic():
+                batches = read_batches(f, batch_size, reject)
+                if sync:
+                    _sync(batches, stats, progress, batch_size)
+                else:
+                    _full_load(batches, stats, progress)
+                quarantine.flush()
+    finally:
+        if errors_f:
+            errors_f.close()
+
+    # charts rendered from the old data are stale now
+    bump_dataset_version('voters')
+
+    elapsed = time.monotonic() - start
+    report(f"Inserted {stats['inserted']}, updated {stats['updated']}, unchanged {stats['unchanged']}, "
+           f"deleted {stats['deleted']}, rejected {stats['rejected']} rows in {elapsed:.1f}s")
+    if geocoded and stats['ungeocoded']:
+        report(f"{stats['ungeocoded']} new or moved voters have no coordinates; "
+               f"run manage.py geocode_voters to place them on the map")
+    return stats
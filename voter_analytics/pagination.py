@@ -0,0 +1,70 @@
+# File: voter_analytics/pagination.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: keyset (seek) pagination for large voter lists
+
+import base64
+import binascii
+import json
+
+
+def encode_cursor(direction, pk):
+    '''return an opaque URL-safe cursor pointing before/after the voter with pk'''
+
+    raw = json.dumps([direction, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    '''return (direction, pk) from a cursor, or (None, None) if it is missing
+    or not one of ours'''
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, pk = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        return None, None
+    if direction not in ('after', 'before') or not isinstance(pk, int):
+        return None, None
+    return direction, pk
+
+
+class KeysetPage:
+    '''One page of a QuerySet ordered by primary key. Pages are found by
+    seeking past the last (or before the first) primary key seen, so every
+    page costs the same indexed range scan, however deep it is.'''
+
+    def __init__(self, queryset, cursor, per_page):
+        direction, pk = decode_cursor(cursor or '')
+
+        if direction == 'before':
+            rows = list(queryset.filter(pk__lt=pk).order_by('-pk')[:per_page + 1])
+            self.has_previous = len(rows) > per_page
+            self.has_next = True
+            rows = rows[:per_page][::-1]
+        else:
+            if direction == 'after':
+                queryset = queryset.filter(pk__gt=pk)
+            rows = list(queryset.order_by('pk')[:per_page + 1])
+            self.has_next = len(rows) > per_page
+            self.has_previous = direction == 'after'
+            rows = rows[:per_page]
+
+        self.object_list = rows
+        if not rows:
+            self.has_next = self.has_previous = False
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        '''cursor for the following page, or None'''
+        return encode_cursor('after', self.object_list[-1].pk) if self.has_next else None
+
+    @property
+    def previous_cursor(self):
+        '''cursor for the preceding page, or None'''
+        return encode_cursor('before', self.object_list[0].pk) if self.has_previous else None
@@ -1,3 +1,163 @@
-from django.test import TestCase
+# File: voter_analytics/tests.py
+# Author: Zacharie Verdieu (zverdieu@bu.edu), 10/18/2026
+# Description: tests for voter_analytics
 
-# Create your tests here.
+import csv
+import io
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from loaders.models import RejectedRow
+
+from .models import *
+from .pagination import KeysetPage
+
+HEADER = ['Voter ID', 'Last Name', 'First Name', 'Street Number', 'Street Name', 'Apartment Number',
+          'Zip Code', 'Date of Birth', 'Date of Registration', 'Party Affiliation', 'Precinct Number',
+          'v20state', 'v21town', 'v21primary', 'v22general', 'v23town', 'voter_score']
+
+# loads bump the dataset version in a test cache, not the shared chart cache
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'charts': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'voter-tests'},
+}
+
+
+def voter_row(voter_id, last_name='Doe', birth='1980-01-01', party='D', precinct='1', zip_code='02459',
+              flags=('TRUE', 'FALSE', 'FALSE', 'TRUE', 'FALSE')):
+    '''one row of the voter file'''
+
+    score = sum(flag == 'TRUE' for flag in flags)
+    return [voter_id, last_name, 'Pat', '12', 'Walnut St', '1', zip_code, birth, '2000-01-01',
+            party, precinct, *flags, str(score)]
+
+
+@override_settings(CACHES=TEST_CACHES)
+class VoterFileTestCase(TestCase):
+    '''fixture: voter files written to a temporary directory'''
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_file(self, name, rows):
+        '''write the header and rows to a CSV file; returns its path'''
+
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(rows)
+        return path
+
+    def load(self, rows, name='voters.csv', **kwargs):
+        '''load_data a file of rows quietly; returns its stats'''
+
+        return load_data(self.write_file(name, rows), report=lambda message: None, **kwargs)
+
+
+class ReingestTests(VoterFileTestCase):
+    '''manage.py reingest_rejects voters'''
+
+    def test_reingest_voter_already_loaded(self):
+        '''a fixed reject whose voter ID a later row already loaded
+        overwrites that voter instead of failing on the unique constraint'''
+
+        stats = self.load([voter_row('ID1', birth='1980-13-01'), voter_row('ID1'), voter_row('ID2')])
+        self.assertEqual((stats['inserted'], stats['rejected']), (2, 1))
+
+        rejected = RejectedRow.objects.get(source='voters')
+        rejected.fields = voter_row('ID1', last_name='Fixed')
+        rejected.save()
+        call_command('reingest_rejects', 'voters', stdout=io.StringIO())
+
+        self.assertFalse(RejectedRow.objects.exists())
+        self.assertEqual(Voter.objects.count(), 2)
+        self.assertEqual(Voter.objects.get(voter_id='ID1').last_name, 'Fixed')
+
+
+class SyncTests(VoterFileTestCase):
+    '''load_data(sync=True) touches only the voters that changed, and adjusts
+    the summary tables to what a full rebuild would give'''
+
+    def summaries(self):
+        '''every VoterSummary and AreaSummary row, without primary keys'''
+
+        return (sorted(VoterSummary.objects.values_list('party_code', 'birth_year', 'voter_score',
+                                                        'participation', 'count')),
+                list(AreaSummary.objects.values_list('kind', 'area', 'voters', 'turnout',
+                                                     'party_mix', 'score_distribution')))
+
+    def test_sync_matches_rebuild(self):
+        '''changed, added and removed voters are counted, and the summaries
+        after the sync equal rebuild_voter_summary and rebuild_area_summaries'''
+
+        self.load([voter_row('ID1'), voter_row('ID2'), voter_row('ID3', party='R', precinct='2'),
+                   voter_row('ID4', zip_code='02460')], name='first.csv')
+        stats = self.load([
+            voter_row('ID1'),
+            # moves to another party, precinct and turnout
+            voter_row('ID2', party='R', precinct='3', flags=('TRUE',) * 5),
+            voter_row('ID4', zip_code='02460', birth='1990-06-01'),
+            voter_row('ID5', party='U', precinct='2'),
+        ], name='second.csv', sync=True)
+
+        self.assertEqual({key: stats[key] for key in ['inserted', 'updated', 'unchanged', 'deleted']},
+                         {'inserted': 1, 'updated': 2, 'unchanged': 1, 'deleted': 1})
+        self.assertEqual(sorted(Voter.objects.values_list('voter_id', flat=True)), ['ID1', 'ID2', 'ID4', 'ID5'])
+        self.assertEqual(Voter.objects.get(voter_id='ID2').precinct_number, 3)
+
+        synced = self.summaries()
+        rebuild_voter_summary()
+        rebuild_area_summaries()
+        self.assertEqual(synced, self.summaries())
+
+
+class KeysetPageTests(VoterFileTestCase):
+    '''KeysetPage cursors lead forward and back to the same pages'''
+
+    def test_next_and_previous_round_trip(self):
+        '''following next_cursor to the end and previous_cursor back to the
+        start visits the same pages'''
+
+        self.load([voter_row(f'ID{i}') for i in range(7)])
+        voters = Voter.objects.all()
+
+        forward = [KeysetPage(voters, None, 3)]
+        while forward[-1].next_cursor:
+            forward.append(KeysetPage(voters, forward[-1].next_cursor, 3))
+        self.assertEqual([len(page) for page in forward], [3, 3, 1])
+        self.assertFalse(forward[0].has_previous)
+        self.assertEqual([v.pk for page in forward for v in page],
+                         list(voters.order_by('pk').values_list('pk', flat=True)))
+
+        back = [forward[-1]]
+        while back[-1].previous_cursor:
+            back.append(KeysetPage(voters, back[-1].previous_cursor, 3))
+        self.assertEqual([list(page) for page in back[::-1]], [list(page) for page in forward])
+        self.assertEqual(KeysetPage(voters, 'not-a-cursor', 3).object_list, forward[0].object_list)
+
+
+class VotersNearTests(TestCase):
+    '''the voters near a point page checks its parameters'''
+
+    def test_bad_parameters(self):
+        '''missing, non-numeric and non-finite values are a 404, not a 500'''
+
+        url = reverse('voters_near')
+        for params in [{}, {'lat': 'x', 'lon': '1'}, {'lat': 'nan', 'lon': '1'},
+                       {'lat': '42.3', 'lon': '-inf'}, {'lat': '42.3', 'lon': '-71.2', 'meters': 'nan'}]:
+            self.assertEqual(self.client.get(url, params).status_code, 404, params)
+
+    def test_meters_clamped(self):
+        '''meters is kept between 0 and VotersNearView.max_meters'''
+
+        url = reverse('voters_near')
+        for meters, expected in [('-50', 0.0), ('1e9', 5000.0), ('150', 150.0)]:
+            response = self.client.get(url, {'lat': '42.3', 'lon': '-71.2', 'meters': meters})
+            self.assertEqual(response.context['meters'], expected)
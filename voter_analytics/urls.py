@@ -9,6 +9,12 @@ from .views import *
 urlpatterns = [
 	path(r'', views.VoterListView.as_view(), name='voters'),
     path(r'voters_list', views.VoterListView.as_view(), name='voters_list'),
+    path(r'voters_list/keyset', views.VoterListView.as_view(keyset_pagination=True), name='voters_keyset'),
     path(r'voter/<int:pk>/', views.VoterDetailView.as_view(), name='voter'),
     path(r'graphs/', views.VoterGraphsView.as_view(), name='graphs'),
+    path(r'precincts/', views.PrecinctSummaryView.as_view(), name='precincts'),
+    path(r'precincts/<int:precinct>/map', views.PrecinctMapView.as_view(), name='precinct_map'),
+    path(r'near/', views.VotersNearView.as_view(), name='voters_near'),
+    path(r'export', views.VoterExportView.as_view(), name='voter_export'),
+    path(r'api/aggregates', views.VoterAggregatesView.as_view(), name='voter_aggregates'),
 ]
\ No newline at end of file
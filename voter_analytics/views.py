@@ -2,16 +2,45 @@
 # Author: Zacharie Verdieu (zverdieu@bu.edu), 10/31/2025
 # Description: Views file which handles requests to voter_analytics app
 
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 
 # Create your views here.
-from django.views.generic import ListView, DetailView
-from . models import Voter
-from datetime import date
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.generic import ListView, DetailView, TemplateView
+from . models import AreaSummary, Voter
+from .filters import ELECTIONS, filter_voters, voter_aggregates
+from .pagination import KeysetPage
+from .facets import voter_facets
+from .columnar import columnar_enabled, voter_columns
+from . import export
+from cs412.charts import cached_charts, chart_key, dataset_version, render_chart
+from datetime import date, datetime, timezone
+import math
 import urllib.parse
 
-import plotly
-import plotly.graph_objs as go
+def search_form_context(params):
+    '''context variables for the search form (search.html): the current
+    choices, and how many voters each choice would match'''
+
+    current_year = date.today().year
+    years = list(range(current_year, 1919, -1))
+    facets = cached_charts('voter_facets', params, 'voters', lambda: voter_facets(params, years))
+
+    context = {
+        'born_after_options': [(year, facets['born_after'][year]) for year in years],
+        'born_before_options': [(year, facets['born_before'][year]) for year in years],
+        'score_options': [(score, facets['voter_score'].get(score, 0)) for score in range(0, 6)],
+        'party_counts': facets['party'],
+        'election_counts': facets['elections'],
+    }
+    for name in ['party_affiliation', 'min_birth_year', 'max_birth_year', 'voter_score',
+                 'v20state', 'v21town', 'v21primary', 'v22general', 'v23town', 'elections_match']:
+        context[name] = params.get(name)
+    return context
 
 class VoterListView(ListView):
     '''view to display voters'''
@@ -20,59 +49,35 @@ class VoterListView(ListView):
     template_name = "voter_analytics/voters.html"
     context_object_name = "voters"
     paginate_by = 100
+    # when True, page with opaque ?cursor= links ordered by primary key
+    # instead of ?page= numbers (OFFSET plus COUNT(*) on every page)
+    keyset_pagination = False
 
     def get_queryset(self):
         ''' filters the records, returning those that satisfy the query'''
 
         voters = super().get_queryset()
+        return filter_voters(voters, self.request.GET)
 
-        # filter based on party affiliation
-        party = self.request.GET.get('party_affiliation')
-        if party:
-            voters = voters.filter(party_affiliation__iexact=party)
-            print(self.request.GET)
+    def paginate_queryset(self, queryset, page_size):
+        '''use keyset pagination when it is turned on for this view'''
 
-        # filter based on minimum birth year
-        min_birth_year = self.request.GET.get('min_birth_year')
-        if min_birth_year:
-            min_birth_date = date(int(min_birth_year), 1, 1)
-            voters = voters.filter(date_of_birth__gte=min_birth_date)
+        if not self.keyset_pagination:
+            return super().paginate_queryset(queryset, page_size)
 
-        # filter based on maximum birth year
-        max_birth_year = self.request.GET.get('max_birth_year')
-        if max_birth_year:
-            max_birth_date = date(int(max_birth_year), 12, 31)
-            voters = voters.filter(date_of_birth__lte=max_birth_date)
-
-        # filter based on voter score
-        voter_score = self.request.GET.get('voter_score')
-        if voter_score:
-            voters = voters.filter(voter_score=voter_score)
-
-        # filter based on whether they voted in past elections
-        for field in ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']:
-            if self.request.GET.get(field):
-                voters = voters.filter(**{field: 'TRUE'})
-
-        return voters
+        page = KeysetPage(queryset, self.request.GET.get('cursor'), page_size)
+        # the total is counted once per filter set and voter data version
+        count = voter_columns().count if columnar_enabled() else lambda params: queryset.count()
+        page.count = cached_charts('voter_count', self.request.GET, 'voters', lambda: count(self.request.GET))
+        return (None, page, page.object_list, page.has_next or page.has_previous)
 
     def get_context_data(self, **kwargs):
         '''provides context veriables for use in template'''
 
         context = super().get_context_data(**kwargs)
-        current_year = date.today().year
-        context['all_years'] = list(range(current_year, 1919, -1))
-        context['scores'] = range(0, 6)
-        context['party_affiliation'] = self.request.GET.get('party_affiliation')
-        context['min_birth_year'] = self.request.GET.get('min_birth_year')
-        context['max_birth_year'] = self.request.GET.get('max_birth_year')
-        context['voter_score'] = self.request.GET.get('voter_score')
-        context['v20state'] = self.request.GET.get('v20state')
-        context['v21town'] = self.request.GET.get('v21town')
-        context['v21primary'] = self.request.GET.get('v21primary')
-        context['v22general'] = self.request.GET.get('v22general')
-        context['v23town'] = self.request.GET.get('v23town')
-        context['action'] = 'voters_list'
+        context.update(search_form_context(self.request.GET))
+        context['keyset_pagination'] = self.keyset_pagination
+        context['action'] = 'voters_keyset' if self.keyset_pagination else 'voters_list'
 
         return context
 
@@ -88,53 +93,42 @@ class VoterDetailView(DetailView):
 
         context = super().get_context_data(**kwargs)
         voter = context['voter']
-        address = f"{voter.street_number} {voter.street_name}, Boston, MA {voter.zip_code}"
-        google_maps = f"https://www.google.com/maps/search/{address.replace(' ', '+')}"
+        if voter.latitude is not None:
+            # exact point from the geocoder
+            google_maps = f"https://www.google.com/maps/search/?api=1&query={voter.latitude},{voter.longitude}"
+        else:
+            address = f"{voter.street_number} {voter.street_name}, Boston, MA {voter.zip_code}"
+            google_maps = f"https://www.google.com/maps/search/{address.replace(' ', '+')}"
         context['maps'] = google_maps
 
         return context
 
-class VoterGraphsView(ListView):
-    '''view for graphs representing voting data'''
+def aggregates_etag(request):
+    '''ETag for VoterAggregatesView: changes with the filters or the voter data'''
 
-    template_name = 'voter_analytics/graphs.html'
-    model = Voter
-    context_object_name = 'voter'
+    return chart_key('voter_aggregates', request.GET, 'voters').rsplit(':', 1)[1]
 
-    def get_queryset(self):
-        ''' filters the records, returning those that satisfy the query'''
 
-        voters = Voter.objects.all()
+def graphs_etag(request):
+    '''ETag for VoterGraphsView, whose search form shows data-dependent counts'''
 
-        # party affiliation
-        party_affiliation = self.request.GET.get('party_affiliation')
-        if party_affiliation:
-            voters = voters.filter(party_affiliation__iexact=party_affiliation)
-            print(self.request.GET)
+    return chart_key('voter_graphs', request.GET, 'voters').rsplit(':', 1)[1]
 
-        # minimum birth year
-        min_birth_year = self.request.GET.get('min_birth_year')
-        if min_birth_year:
-            min_birth_date = date(int(min_birth_year), 1, 1)
-            voters = voters.filter(date_of_birth__gte=min_birth_date)
 
-        # maximum birth year
-        max_birth_year = self.request.GET.get('max_birth_year')
-        if max_birth_year:
-            max_birth_date = date(int(max_birth_year), 12, 31)
-            voters = voters.filter(date_of_birth__lte=max_birth_date)
+def voters_last_modified(request):
+    '''Last-Modified for the voter graphs and aggregates: when the voter data was last loaded'''
 
-        # voter score
-        voter_score = self.request.GET.get('voter_score')
-        if voter_score:
-            voters = voters.filter(voter_score=voter_score)
+    return datetime.fromtimestamp(dataset_version('voters')['modified'], tz=timezone.utc)
 
-        # voted elections
-        for field in ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']:
-            if self.request.GET.get(field):
-                voters = voters.filter(**{field: 'TRUE'})
 
-        return voters
+@method_decorator(cache_control(public=True, no_cache=True), name='get')
+@method_decorator(condition(etag_func=graphs_etag, last_modified_func=voters_last_modified), name='get')
+class VoterGraphsView(TemplateView):
+    '''view for graphs representing voting data; the page only holds the
+    search form, and the graphs are drawn in the browser from the JSON
+    returned by VoterAggregatesView'''
+
+    template_name = 'voter_analytics/graphs.html'
 
     def get_context_data(self, **kwargs):
         """
@@ -142,63 +136,149 @@ class VoterGraphsView(ListView):
         """
 
         context = super().get_context_data(**kwargs)
-        filtered = self.get_queryset()
-
-        # bar graph 1
-        birthyear = [voter.date_of_birth.year for voter in filtered]
-        fig_one = go.Histogram(x=birthyear, nbinsx=100)
-        title_one = f"Voter Distribution by Birth Year (n={len(birthyear)})"
-
-        layout1 = go.Layout(
-            bargap=0.5,
-            xaxis=dict(title='Birth Year'),
-            yaxis=dict(title='Count')
-        )
-
-        bar1 = plotly.offline.plot({"data": [fig_one],
-                                               "layout": layout1,
-                                               "layout_title_text": title_one,},
-                                              auto_open=False,
-                                              output_type="div")
-
-        # pie chart
-        party_count = {}
-        for voter in filtered:
-            party = voter.party_affiliation
-            party_count[party] = party_count.get(party, 0) + 1
-        fig_two = go.Pie(labels=list(party_count.keys()), values=list(party_count.values()))
-        title_two = f"Voter Distribution by Party (n={len(filtered)})"
-        pie = plotly.offline.plot({"data": [fig_two],
-                                               "layout_title_text": title_two,},
-                                                auto_open=False,
-                                                output_type="div")
-
-        # bar graph 2
-        elections = ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']
-        vote_count = []
-        for election in elections:
-            count = filtered.filter(**{election: 'TRUE'}).count()
-            vote_count.append(count)
-        fig_three = go.Bar(x=elections, y=vote_count)
-        title_three = f"Vote Count by Voted Elections (n={Voter.objects.count()})"
-        bar2 = plotly.offline.plot({"data": [fig_three],
-                                                   "layout_title_text": title_three,},
-                                                    auto_open=False,
-                                                    output_type="div")
-
-        # graphs
-        context['graph_birth'] = bar1
-        context['graph_party'] = pie
-        context['graph_elections'] = bar2
-
-        current_year = date.today().year
-        context['all_years'] = list(range(current_year, 1919, -1))
-        context['scores'] = range(0, 6)
-
-        context['party_affiliation'] = self.request.GET.get('party_affiliation')
-        context['min_birth_year'] = self.request.GET.get('min_birth_year')
-        context['max_birth_year'] = self.request.GET.get('max_birth_year')
-        context['voter_score'] = self.request.GET.get('voter_score')
+        context.update(search_form_context(self.request.GET))
         context['action'] = 'graphs'
 
-        return context
\ No newline at end of file
+        return context
+
+
+@method_decorator(cache_control(public=True, no_cache=True), name='get')
+@method_decorator(condition(etag_func=aggregates_etag, last_modified_func=voters_last_modified), name='get')
+class VoterAggregatesView(View):
+    '''JSON API returning the histograms behind the voter graphs, for the
+    same filters as VoterListView. Clients revalidate with ETag or
+    Last-Modified and get a 304 until the filters or the data change.'''
+
+    def get_data(self):
+        '''run the aggregate queries and shape them as compact JSON'''
+
+        if columnar_enabled():
+            stats = voter_columns().aggregates(self.request.GET)
+        else:
+            stats = voter_aggregates(filter_voters(Voter.objects.all(), self.request.GET))
+        return {
+            'total': stats['total'],
+            'birth_year': {'labels': list(stats['birth_years']), 'counts': list(stats['birth_years'].values())},
+            'party': {'labels': list(stats['parties']), 'counts': list(stats['parties'].values())},
+            'elections': {'labels': list(stats['elections']), 'counts': list(stats['elections'].values())},
+        }
+
+    def get(self, request, *args, **kwargs):
+        '''return the aggregates, computed once per filter set and data version'''
+
+        data = cached_charts('voter_aggregates', request.GET, 'voters', self.get_data)
+        return JsonResponse(data)
+
+
+class VoterExportView(View):
+    '''Download the voters matching the same filters as VoterListView, as
+    CSV (default) or, with ?format=parquet and pyarrow installed, Parquet.
+    Rows are streamed from a server-side cursor, so memory stays flat.'''
+
+    def get(self, request, *args, **kwargs):
+        '''stream the filtered voter list'''
+
+        voters = filter_voters(Voter.objects.all(), request.GET)
+
+        if request.GET.get('format') == 'parquet':
+            if export.pa is None:
+                return HttpResponseBadRequest("Parquet export needs pyarrow installed on the server.")
+            response = StreamingHttpResponse(export.parquet_stream(voters),
+                                             content_type='application/vnd.apache.parquet')
+            response['Content-Disposition'] = 'attachment; filename="voters.parquet"'
+            return response
+
+        response = StreamingHttpResponse(export.csv_stream(voters), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="voters.csv"'
+        return response
+
+
+class PrecinctSummaryView(ListView):
+    '''view to display turnout, party mix and voter scores per precinct and
+    per zip code, read from the precomputed AreaSummary table'''
+
+    model = AreaSummary
+    template_name = "voter_analytics/precincts.html"
+    context_object_name = "areas"
+
+    def get_context_data(self, **kwargs):
+        '''provides context veriables for use in template'''
+
+        context = super().get_context_data(**kwargs)
+        areas = list(context['areas'])
+        context['precincts'] = sorted((a for a in areas if a.kind == 'precinct'), key=lambda a: int(a.area))
+        context['zip_codes'] = [a for a in areas if a.kind == 'zip']
+        context['elections'] = ELECTIONS
+        return context
+
+
+class VotersNearView(TemplateView):
+    '''view to display the geocoded voters within a distance of a point,
+    given as ?lat=..&lon=..&meters=.. or ?voter=<pk>&meters=..'''
+
+    template_name = "voter_analytics/voters_near.html"
+    max_meters = 5000
+
+    def get_context_data(self, **kwargs):
+        '''provides context veriables for use in template'''
+
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET
+        try:
+            meters = float(params.get('meters', 200))
+            if params.get('voter'):
+                center = get_object_or_404(Voter, pk=int(params['voter']), latitude__isnull=False)
+                lat, lon = center.latitude, center.longitude
+                context['center'] = center
+            else:
+                lat, lon = float(params['lat']), float(params['lon'])
+            # float() also accepts 'nan' and 'inf'
+            if not all(math.isfinite(value) for value in (lat, lon, meters)):
+                raise ValueError('expected finite numbers')
+            meters = max(0.0, min(meters, self.max_meters))
+        except (KeyError, ValueError):
+            raise Http404("expected lat and lon, or voter, and an optional meters")
+
+        context.update(lat=lat, lon=lon, meters=meters, nearby=Voter.near(lat, lon, meters))
+        return context
+
+
+class PrecinctMapView(TemplateView):
+    '''view to display a map of the geocoded voters in one precinct'''
+
+    template_name = "voter_analytics/precinct_map.html"
+
+    def get_context_data(self, **kwargs):
+        '''provides context veriables for use in template'''
+
+        context = super().get_context_data(**kwargs)
+        precinct = str(self.kwargs['precinct'])
+        context['precinct'] = precinct
+        context.update(cached_charts('precinct_map', {'precinct': precinct}, 'voters',
+                                     lambda: self.render_map(precinct)))
+        return context
+
+    def render_map(self, precinct):
+        '''render the precinct's voters as a map; only the coordinates are
+        read, which voter_precinct_geo_idx covers without touching the table'''
+
+        points = list(Voter.objects.filter(precinct_number=precinct, latitude__isnull=False)
+                      .values_list('latitude', 'longitude'))
+        if not points:
+            return {'map': None, 'mapped': 0}
+
+        lats = [lat for lat, lon in points]
+        lons = [lon for lat, lon in points]
+        figure = {
+            'data': [{'type': 'scattermap', 'lat': lats, 'lon': lons, 'mode': 'markers',
+                      'marker': {'size': 5}}],
+            'layout': {
+                'title': f'Voters in Precinct {precinct}',
+                'map': {'style': 'open-street-map', 'zoom': 14,
+                        'center': {'lat': sum(lats) / len(lats), 'lon': sum(lons) / len(lons)}},
+                'margin': {'l': 0, 'r': 0, 't': 40, 'b': 0},
+                'height': 600,
+            },
+        }
+        return {'map': render_chart(figure), 'mapped': len(points)}
+